@@ -49,8 +49,7 @@ def example_batch_measurements():
             results = []
             
             for freq in frequencies:
-                lcr.set_freq(freq)
-                time.sleep(0.1)  # Allow settling time
+                lcr.set_freq(freq)  # Returns once *OPC? reports the new frequency applied
                 measurement = lcr.measure()
                 results.append((freq, measurement))
                 print(f"  {freq} Hz: {measurement}")
@@ -123,9 +122,8 @@ def example_custom_command_sequence():
             ]
             
             print("Executing custom initialization sequence...")
-            for cmd in commands:
-                lcr.send(cmd)
-                time.sleep(0.01)  # Small delay between commands
+            # One compound message (cmd1;cmd2;...), then wait for completion via *OPC?
+            lcr.send_many(commands, safe=True)
             
             print("Initialization complete")
             
@@ -138,12 +136,12 @@ def example_custom_command_sequence():
             ]
             
             print("Device state:")
-            for name, query in state_queries:
-                try:
-                    response = lcr.query(query)
+            try:
+                responses = lcr.query_many([query for _, query in state_queries])
+                for (name, _), response in zip(state_queries, responses):
                     print(f"  {name}: {response}")
-                except Exception as e:
-                    print(f"  {name}: Query failed - {e}")
+            except Exception as e:
+                print(f"  Query failed - {e}")
 
 def example_error_handling():
     """Example of comprehensive error handling"""
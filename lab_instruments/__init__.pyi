@@ -1,16 +1,19 @@
-from typing import overload, Union, Literal
+# Auto-generated stub file
+# Do not edit manually - this file is automatically updated
+
+from typing import Callable, overload, Union, Literal
 from .core.scpi.common_scpi import CommonSCPI, SCPIError
 from .core.interfaces import ConnectionInterface
-from .plugins.plz164w.plz164w_scpi import PLZ164WSCPI
 from .plugins.im3590.im3590_scpi import IM3590SCPI
+from .plugins.plz164w.plz164w_scpi import PLZ164WSCPI
 
 __version__: str
 
 # Device-specific overloads
 @overload
-def connect(dev: Literal["plz164w"], method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> PLZ164WSCPI: ...
-@overload
 def connect(dev: Literal["im3590"], method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> IM3590SCPI: ...
+@overload
+def connect(dev: Literal["plz164w"], method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> PLZ164WSCPI: ...
 
 # Generic device (string)
 @overload
@@ -22,8 +25,24 @@ def connect(dev: None = None, method: str = ..., plugins_dir: str = "lab_instrum
 
 def connect(dev = None, method = None, plugins_dir: str = "lab_instruments/plugins", **kwargs): ...
 
+def acquire(dev: str = None, method: str = None, **kwargs) -> Union[CommonSCPI, ConnectionInterface]: ...
+
+def release(instance: Union[CommonSCPI, ConnectionInterface]) -> None: ...
+
 def list_devices() -> list[str]: ...
 
+def clear_connection_pool() -> None: ...
+
+def get_pool_size() -> int: ...
+
+def on_connection_event(callback: Callable[[dict], None]) -> Callable[[dict], None]: ...
+
+def on_device_change(callback: Callable[[], None]) -> Callable[[], None]: ...
+
+# Typed connect functions (auto-generated)
+def connect_im3590(method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> IM3590SCPI: ...
+def connect_plz164w(method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> PLZ164WSCPI: ...
+
 # Other exports
 registry: object
 CommonSCPI: type[CommonSCPI]
@@ -1,10 +1,25 @@
-from .connection_factory import create_connection, create_raw_connection
+from .connection_factory import (
+    create_connection,
+    create_raw_connection,
+    clear_connection_pool,
+    get_pool_size,
+    on_connection_event,
+    load_config,
+    preload_configs,
+    register_connection_method,
+)
 from .scpi.common_scpi import CommonSCPI, SCPIError
 
 __version__ = "1.0.0"
 __all__ = [
     'create_connection',
     'create_raw_connection',
+    'clear_connection_pool',
+    'get_pool_size',
+    'on_connection_event',
+    'load_config',
+    'preload_configs',
+    'register_connection_method',
     'CommonSCPI', 
     'SCPIError',
 ]
@@ -1,42 +1,208 @@
+import atexit
+import copy
+import importlib
+import json
+import os
+import threading
+from .interfaces.connection import ConnectionContextMixin
+
+# Prefer orjson for config parsing when installed; it accepts bytes like json.loads
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Parsed config.json files keyed by absolute path: (mtime, config)
+_CONFIG_CACHE: dict[str, tuple[float, dict]] = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+_TERMINATOR_TABLE = {
+    'CR': '\r',
+    'LF': '\n',
+    'CRLF': '\r\n',
+    'LFCR': '\n\r',
+}
+
 def parse_terminator(val):
-    if isinstance(val, str):
-        table = {
-            'CR': '\r',
-            'LF': '\n',
-            'CRLF': '\r\n',
-            'LFCR': '\n\r',
-        }
-        upper = val.upper()
-        return table.get(upper, val)
-    return val
-
-def create_connection(method, config=None, kwargs=None):
-    """Create connection interface based on method and parameters"""
+    if type(val) is not str:
+        return val
+    # Already-decoded terminators ("\r\n" etc.) skip the upper() call
+    return _TERMINATOR_TABLE.get(val.upper(), val) if val.isalpha() else val
+
+def load_config_file(config_path):
+    """Load a config.json file, reusing the parsed result while its mtime is unchanged"""
+    config_path = os.path.abspath(config_path)
+    try:
+        mtime = os.stat(config_path).st_mtime
+        with _CONFIG_CACHE_LOCK:
+            entry = _CONFIG_CACHE.get(config_path)
+            if entry is None or entry[0] != mtime:
+                with open(config_path, 'rb') as f:
+                    entry = (mtime, _json_loads(f.read()))
+                _CONFIG_CACHE[config_path] = entry
+    except IsADirectoryError:
+        raise FileNotFoundError(f'Config file not found: {config_path}') from None
+    except json.JSONDecodeError as e:
+        # Name the file; orjson/json messages only give the position
+        doc = e.doc.decode('utf-8', 'replace') if isinstance(e.doc, bytes) else e.doc
+        raise json.JSONDecodeError(f'{e.msg} in {config_path}', doc, e.pos) from None
+    # Return a copy so callers mutating *_params don't poison the cache
+    return copy.deepcopy(entry[1])
+
+def load_config(dev, plugins_dir="lab_instruments/plugins"):
+    """Load plugins/{dev}/config.json"""
+    config_path = os.path.join(plugins_dir, dev, 'config.json')
+    try:
+        return load_config_file(config_path)
+    except FileNotFoundError:
+        raise ValueError(f'Config file for {dev} not found in {plugins_dir}.') from None
+
+def preload_configs(plugins_dir="lab_instruments/plugins"):
+    """Parse every plugin config.json under plugins_dir into the cache; returns loaded device names"""
+    loaded = []
+    with os.scandir(plugins_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+            try:
+                load_config(entry.name, plugins_dir)
+            except ValueError:
+                continue
+            loaded.append(entry.name)
+    return loaded
+
+# Connection class (or "module:Class" path imported on first use) and config params key for each communication method
+_CONN_CLASSES = {
+    'serial': ('.interfaces.serial_interface:SerialConnection', 'serial_params'),
+    'socket': ('.interfaces.socket_interface:SocketConnection', 'socket_params'),
+    'visa': ('.interfaces.visa_interface:VisaConnection', 'visa_params'),
+}
+
+def register_connection_method(name, conn_class, params_key=None):
+    """Register a connection class for a method; its params are read from config[params_key] ({name}_params by default)"""
+    name = name.lower()
+    _CONN_CLASSES[name] = (conn_class, params_key or f'{name}_params')
+
+def _get_connection_class(method):
+    """Resolve (conn_class, params_key) for a method, importing and memoizing lazy entries"""
+    try:
+        conn_class, params_key = _CONN_CLASSES[method]
+    except KeyError:
+        raise ValueError(f'Unknown method: {method}')
+    if isinstance(conn_class, str):
+        module_name, _, class_name = conn_class.partition(':')
+        conn_class = getattr(importlib.import_module(module_name, __package__), class_name)
+        _CONN_CLASSES[method] = (conn_class, params_key)
+    return conn_class, params_key
+
+# Open connections shared through use_pool=True, keyed by (method, endpoint): [conn, handles in use].
+# Handles keep a reference to their entry, so the count stays with the connection after clear_connection_pool().
+_POOL: dict[tuple, list] = {}
+_POOL_LOCK = threading.Lock()
+
+class PooledConnection(ConnectionContextMixin):
+    """Handle to a pooled connection; disconnect() releases the handle and leaves the shared connection open"""
+
+    def __init__(self, key, entry):
+        self._key = key
+        self._entry = entry
+        self.conn = conn = entry[0]
+        self._acquired = False
+        # Bind I/O directly to the shared connection so calls don't go through the handle
+        self.write = conn.write
+        self.read = conn.read
+        self.query = conn.query
+        self.query_pipelined = conn.query_pipelined
+        self.read_binary = conn.read_binary
+        self._read_exact = conn._read_exact
+        self.is_connected = conn.is_connected
+
+    def connect(self):
+        if self._acquired:
+            return
+        with _POOL_LOCK:
+            self.conn.connect()  # No-op while the shared connection is already open
+            self._entry[1] += 1
+        self._acquired = True
+
+    def disconnect(self):
+        if not self._acquired:
+            return
+        self._acquired = False
+        with _POOL_LOCK:
+            entry = self._entry
+            entry[1] -= 1
+            if entry[1] == 0 and _POOL.get(self._key) is not entry:
+                # Last handle of a connection dropped from the pool by clear_connection_pool()
+                self.conn.disconnect()
+
+def _acquire_pooled(method, conn_class, params):
+    key = (method, params.get('host'), params.get('port'), params.get('address'))
+    with _POOL_LOCK:
+        entry = _POOL.get(key)
+        if entry is None:
+            entry = _POOL[key] = [conn_class(**params), 0]
+    return PooledConnection(key, entry)
+
+def clear_connection_pool():
+    """Empty the pool, closing idle connections; connections still in use close with their last handle"""
+    with _POOL_LOCK:
+        idle = [conn for conn, in_use in _POOL.values() if not in_use]
+        _POOL.clear()
+    for conn in idle:
+        if conn.is_connected():
+            conn.disconnect()
+
+def get_pool_size():
+    """Return the number of pooled connections"""
+    return len(_POOL)
+
+atexit.register(clear_connection_pool)
+
+# Callbacks taking an event dict {'method', 'success', 'error'}, called for each create_connection()
+_CONNECTION_LISTENERS = []
+
+def on_connection_event(callback):
+    """Register callback(event) to be called whenever a connection is created or fails to be created"""
+    _CONNECTION_LISTENERS.append(callback)
+    return callback
+
+def _notify_connection(method, error=None):
+    event = {'method': method, 'success': error is None, 'error': None if error is None else str(error)}
+    for callback in _CONNECTION_LISTENERS:
+        callback(event)
+
+def create_connection(method, config=None, kwargs=None, use_pool=False):
+    """
+    Create connection interface based on method and parameters.
+    use_pool=True returns a handle to a shared connection for the same endpoint,
+    opened once and kept open across connect/disconnect until clear_connection_pool().
+    """
     comm_method = (method or (config.get('method', '') if config else '')).lower()
-    if comm_method == 'serial':
-        from .interfaces import SerialConnection
-        params = {**(config.get('serial_params', {}) if config else {}), **(kwargs or {})}
+    try:
+        conn_class, params_key = _get_connection_class(comm_method)
+        params = {**(config.get(params_key, {}) if config else {}), **(kwargs or {})}
         if 'terminator' in params:
             params['terminator'] = parse_terminator(params['terminator'])
-        return SerialConnection(**params)
-    elif comm_method == 'socket':
-        from .interfaces import SocketConnection
-        params = {**(config.get('socket_params', {}) if config else {}), **(kwargs or {})}
-        if 'terminator' in params:
-            params['terminator'] = parse_terminator(params['terminator'])
-        return SocketConnection(**params)
-    elif comm_method == 'visa':
-        from .interfaces import VisaConnection
-        params = {**(config.get('visa_params', {}) if config else {}), **(kwargs or {})}
-        if 'terminator' in params:
-            params['terminator'] = parse_terminator(params['terminator'])
-        return VisaConnection(**params)
-    else:
-        raise ValueError(f'Unknown method: {comm_method}')
+        if use_pool:
+            conn = _acquire_pooled(comm_method, conn_class, params)
+        else:
+            conn = conn_class(**params)
+    except Exception as e:
+        if _CONNECTION_LISTENERS:
+            _notify_connection(comm_method, e)
+        raise
+    if _CONNECTION_LISTENERS:
+        _notify_connection(comm_method)
+    return conn
+
+def _validate_method(method):
+    """Return the lower-cased connection method, raising ValueError if it is not registered"""
+    comm_method = (method or '').lower()
+    if comm_method not in _CONN_CLASSES:
+        raise ValueError(f'Method must be one of: {", ".join(_CONN_CLASSES)}.')
+    return comm_method
 
 def create_raw_connection(method, **kwargs):
     """Create raw connection interface without device-specific wrapper"""
-    comm_method = (method or '').lower()
-    if comm_method not in ('serial', 'socket', 'visa'):
-        raise ValueError('Method must be "serial", "socket", or "visa".')
-    return create_connection(method, None, kwargs)
+    return create_connection(_validate_method(method), None, kwargs)
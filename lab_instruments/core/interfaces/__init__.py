@@ -1,10 +1,24 @@
-from .connection import ConnectionInterface
-from .serial_interface import SerialConnection
-from .socket_interface import SocketConnection
-from .visa_interface import VisaConnection
+import importlib
+from .connection import ConnectionInterface, ConnectionContextMixin
+
+# Transport classes are imported on first access so pyserial/pyvisa load only when used
+_LAZY_CLASSES = {
+    "SerialConnection": ".serial_interface",
+    "SocketConnection": ".socket_interface",
+    "VisaConnection": ".visa_interface",
+}
+
+def __getattr__(name):
+    module_name = _LAZY_CLASSES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "ConnectionInterface",
+    "ConnectionContextMixin",
     "SerialConnection",
     "SocketConnection",
     "VisaConnection",
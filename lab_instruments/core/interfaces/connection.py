@@ -1,6 +1,39 @@
-from abc import ABC, abstractmethod
+from typing import Protocol, runtime_checkable
+
+@runtime_checkable
+class ConnectionInterface(Protocol):
+    """Structural interface of a connection; concrete classes inherit ConnectionContextMixin"""
+
+    def __enter__(self): ...
+
+    def __exit__(self, exc_type, exc_val, exc_tb): ...
+
+    def connect(self) -> None: ...
+
+    def disconnect(self) -> None: ...
+
+    def write(self, command: str) -> None: ...
+
+    def read(self) -> str: ...
+
+    def query(self, command: str) -> str: ...
+
+    def query_pipelined(self, commands: list[str]) -> list[str]: ...
+
+    def read_binary(self, dtype=None): ...
+
+    def _read_exact(self, size: int) -> bytes:
+        """Read exactly size raw bytes; the transport hook behind ConnectionContextMixin.read_binary"""
+        ...
+
+    def is_connected(self) -> bool: ...
+
+class ConnectionContextMixin:
+    """
+    Behaviour shared by connection implementations (plain class: no ABCMeta on instantiation).
+    Subclasses implement the ConnectionInterface methods, including _read_exact for read_binary.
+    """
 
-class ConnectionInterface(ABC):
     def __enter__(self):
         self.connect()
         return self
@@ -8,29 +41,32 @@ class ConnectionInterface(ABC):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.disconnect()
 
-    @abstractmethod
-    def connect(self) -> None:
-        pass
-
-    @abstractmethod
-    def disconnect(self) -> None:
-        pass
-
-    @abstractmethod
-    def write(self, command: str) -> None:
-        pass
-
-    @abstractmethod
-    def read(self) -> str:
-        pass
-
-    @abstractmethod
-    def query(self, command: str) -> str:
-        pass
+    def query_pipelined(self, commands: list[str]) -> list[str]:
+        """
+        Send all queries before reading any response, so the instrument can work
+        through its input queue while earlier responses are in flight.
+        Each command must produce exactly one response line.
+        """
+        for command in commands:
+            self.write(command)
+        return [self.read() for _ in commands]
 
-    @abstractmethod
-    def is_connected(self) -> bool:
-        pass
+    def read_binary(self, dtype=None):
+        """
+        Read an IEEE 488.2 definite-length block (#<ndigits><length><data>) and its terminator.
+        Returns the raw bytes, or a numpy array view over them when dtype is given
+        (e.g. '<f4'; requires numpy).
+        """
+        header = self._read_exact(2)
+        if header[:1] != b'#' or not header[1:2].isdigit() or header[1:2] == b'0':
+            raise ConnectionProtocolError(f"Invalid definite-length block header: {header!r}")
+        length = int(self._read_exact(int(header[1:2])))
+        data = self._read_exact(length)
+        self.read()  # consume response message terminator
+        if dtype is None:
+            return data
+        import numpy
+        return numpy.frombuffer(data, dtype=dtype)
 
 class ConnectionError(Exception):
     pass
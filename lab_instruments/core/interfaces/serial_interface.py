@@ -1,19 +1,21 @@
 import serial
 from typing import Optional
 from .connection import(
-    ConnectionInterface,
+    ConnectionContextMixin,
     ConnectionClosedError,
     ConnectionIOError,
     ConnectionTimeoutError,
 ) 
 
-class SerialConnection(ConnectionInterface):
-    def __init__(self, port: str = "/dev/ttyACM0", baudrate: int = 9600, timeout: float = 1.0, terminator: str = "\r\n"):
+class SerialConnection(ConnectionContextMixin):
+    def __init__(self, port: str = "/dev/ttyACM0", baudrate: int = 9600, timeout: float = 1.0, terminator: str = "\r\n", low_latency: bool = True):
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
         self.terminator = terminator
+        self.low_latency = low_latency
         self.ser: Optional[serial.Serial] = None
+        self._term_bytes = terminator.encode()
 
     def connect(self):
         if self.ser is not None and self.ser.is_open:
@@ -22,6 +24,17 @@ class SerialConnection(ConnectionInterface):
             self.ser = serial.Serial(self.port, self.baudrate, timeout=self.timeout)
         except serial.SerialException as e:
             raise ConnectionIOError(f"Failed to open serial port: {e}")
+        if self.low_latency:
+            self._enable_low_latency()
+
+    def _enable_low_latency(self):
+        """Set ASYNC_LOW_LATENCY (best effort) so USB-serial adapters such as FTDI
+        don't hold reads for their ~16 ms latency timer"""
+        try:
+            self.ser.set_low_latency_mode(True)
+        except (AttributeError, ValueError, OSError):
+            # Not supported on this platform/driver (e.g. Windows, CDC-ACM)
+            pass
 
     def disconnect(self):
         try:
@@ -35,7 +48,7 @@ class SerialConnection(ConnectionInterface):
         if not self.is_connected() or self.ser is None:
             raise ConnectionClosedError("Serial port is not connected")
         try:
-            self.ser.write((command + self.terminator).encode())
+            self.ser.write(command.encode() + self._term_bytes)
         except serial.SerialTimeoutException as e:
             raise ConnectionTimeoutError(f"Serial write timeout: {e}")
         except serial.SerialException as e:
@@ -45,12 +58,30 @@ class SerialConnection(ConnectionInterface):
         if not self.is_connected() or self.ser is None:
             raise ConnectionClosedError("Serial port is not connected")
         try:
-            return self.ser.readline().decode(errors='ignore').strip()
+            # Frame on the configured terminator (readline would only stop at LF)
+            data = self.ser.read_until(self._term_bytes)
+            if not data:
+                # pyserial returns b'' instead of raising when the read timeout expires
+                raise ConnectionTimeoutError("Serial read timeout: no data")
+            if data.endswith(self._term_bytes):
+                data = data[:-len(self._term_bytes)]
+            return data.strip().decode(errors='ignore')
         except serial.SerialTimeoutException as e:
             raise ConnectionTimeoutError(f"Serial read timeout: {e}")
         except serial.SerialException as e:
             raise ConnectionIOError(f"Serial read error: {e}")
 
+    def _read_exact(self, size: int) -> bytes:
+        if not self.is_connected() or self.ser is None:
+            raise ConnectionClosedError("Serial port is not connected")
+        try:
+            data = self.ser.read(size)
+        except serial.SerialException as e:
+            raise ConnectionIOError(f"Serial read error: {e}")
+        if len(data) < size:
+            raise ConnectionTimeoutError(f"Serial read timeout: got {len(data)} of {size} bytes")
+        return data
+
     def query(self, command):
         self.write(command)
         return self.read()
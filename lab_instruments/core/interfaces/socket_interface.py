@@ -1,25 +1,35 @@
 import socket
 from typing import Optional
 from .connection import ( 
-    ConnectionInterface,
+    ConnectionContextMixin,
     ConnectionTimeoutError,
     ConnectionIOError,
     ConnectionClosedError,
 )
 
-class SocketConnection(ConnectionInterface):
+class SocketConnection(ConnectionContextMixin):
     def __init__(self, host: str, port: int, timeout: float = 1.0, terminator: str = "\r\n"):
         self.host = host
         self.port = port
         self.timeout = timeout
         self.terminator = terminator
         self.sock: Optional[socket.socket] = None
+        self._term_bytes = terminator.encode()
+        # Received bytes not yet returned by read() (kept across calls)
+        self._rbuf = bytearray()
+        # Preallocated receive buffer so recv doesn't allocate a bytes object per chunk
+        self._recv_view = memoryview(bytearray(65536))
 
     def connect(self):
         if self.sock is not None:
             return  # Already connected
         try:
             self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            # SCPI is small request/response packets: disable Nagle to avoid delayed-ACK stalls
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Room for a large trace/waveform response without stalling the sender
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+            self._rbuf.clear()
         except socket.timeout as e:
             raise ConnectionTimeoutError(f"Socket connect timeout: {e}")
         except OSError as e:
@@ -32,12 +42,13 @@ class SocketConnection(ConnectionInterface):
         except OSError as e:
             raise ConnectionIOError(f"Failed to close socket: {e}")
         self.sock = None
+        self._rbuf.clear()
 
     def write(self, command: str):
         if not self.is_connected() or self.sock is None:
             raise ConnectionClosedError("Socket is not connected")
         try:
-            self.sock.sendall((command + self.terminator).encode())
+            self.sock.sendall(command.encode() + self._term_bytes)
         except socket.timeout as e:
             raise ConnectionTimeoutError(f"Socket write timeout: {e}")
         except OSError as e:
@@ -46,23 +57,82 @@ class SocketConnection(ConnectionInterface):
     def read(self) -> str:
         if not self.is_connected() or self.sock is None:
             raise ConnectionClosedError("Socket is not connected")
-        data = b''
-        terminator_bytes = self.terminator.encode()
+        buf = self._rbuf
+        term = self._term_bytes
         try:
-            while not data.endswith(terminator_bytes):
-                chunk = self.sock.recv(1024)
-                if not chunk:
+            if not buf:
+                # Common case: whole response arrives in one segment, decode it straight
+                # from the receive buffer without staging it in _rbuf
+                n = self.sock.recv_into(self._recv_view)
+                if not n:
+                    raise ConnectionClosedError("Socket closed by peer")
+                chunk = self._recv_view[:n].tobytes()
+                if chunk.find(term) == n - len(term) > -1:
+                    return chunk[:-len(term)].strip().decode(errors='ignore')
+                buf += chunk
+            idx = buf.find(term)
+            while idx == -1:
+                # Only rescan the tail that could hold a terminator split across chunks
+                start = max(0, len(buf) - len(term) + 1)
+                n = self.sock.recv_into(self._recv_view)
+                if not n:
+                    if not buf:
+                        raise ConnectionClosedError("Socket closed by peer")
                     break
-                data += chunk
+                buf += self._recv_view[:n]
+                idx = buf.find(term, start)
         except socket.timeout as e:
             raise ConnectionTimeoutError(f"Socket read timeout: {e}")
         except OSError as e:
             raise ConnectionIOError(f"Socket read error: {e}")
-        return data.decode(errors='ignore').strip()
+        if idx == -1:
+            # Connection closed before a terminator arrived
+            data = buf[:]
+            buf.clear()
+        else:
+            data = buf[:idx]
+            del buf[:idx + len(term)]
+        # Terminator is already excluded; trim padding on bytes and decode once
+        return data.strip().decode(errors='ignore')
+
+    def _read_exact(self, size: int) -> bytes:
+        """Read size bytes, receiving straight into the result buffer after draining _rbuf"""
+        if not self.is_connected() or self.sock is None:
+            raise ConnectionClosedError("Socket is not connected")
+        out = bytearray(size)
+        view = memoryview(out)
+        buf = self._rbuf
+        got = min(len(buf), size)
+        view[:got] = buf[:got]
+        del buf[:got]
+        try:
+            while got < size:
+                n = self.sock.recv_into(view[got:])
+                if not n:
+                    raise ConnectionClosedError("Socket closed during binary read")
+                got += n
+        except socket.timeout as e:
+            raise ConnectionTimeoutError(f"Socket read timeout: {e}")
+        except OSError as e:
+            raise ConnectionIOError(f"Socket read error: {e}")
+        return bytes(out)
 
     def query(self, command: str):
         self.write(command)
         return self.read()
 
+    def query_pipelined(self, commands: list[str]) -> list[str]:
+        """Send all queries in one sendall, then read one response per query"""
+        if not self.is_connected() or self.sock is None:
+            raise ConnectionClosedError("Socket is not connected")
+        term = self._term_bytes
+        try:
+            self.sock.sendall(term.join([command.encode() for command in commands]) + term)
+        except socket.timeout as e:
+            raise ConnectionTimeoutError(f"Socket write timeout: {e}")
+        except OSError as e:
+            raise ConnectionIOError(f"Socket write error: {e}")
+        return [self.read() for _ in commands]
+
     def is_connected(self):
         return self.sock is not None
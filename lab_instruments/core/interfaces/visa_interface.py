@@ -1,11 +1,27 @@
 import pyvisa
 from .connection import (
-    ConnectionInterface,
+    ConnectionContextMixin,
     ConnectionClosedError,
+    ConnectionTimeoutError,
     ConnectionIOError,
 )
 
-class VisaConnection(ConnectionInterface):
+# Shared ResourceManager: creating one loads the VISA library, so do it once per process
+_RM = None
+
+def _get_rm():
+    global _RM
+    if _RM is None:
+        _RM = pyvisa.ResourceManager()
+    return _RM
+
+def _visa_error(action, e):
+    """Map a VisaIOError to ConnectionTimeoutError (VI_ERROR_TMO) or ConnectionIOError"""
+    if e.error_code == pyvisa.constants.StatusCode.error_timeout:
+        return ConnectionTimeoutError(f"VISA {action} timeout: {e}")
+    return ConnectionIOError(f"VISA {action} error: {e}")
+
+class VisaConnection(ConnectionContextMixin):
     def __init__(self, address: str, timeout: float = 1.0, terminator: str = '\n'):
         self.address = address
         self.timeout = timeout
@@ -17,7 +33,7 @@ class VisaConnection(ConnectionInterface):
         if self.inst is not None:
             return
         try:
-            self.rm = pyvisa.ResourceManager()
+            self.rm = _get_rm()
             self.inst = self.rm.open_resource(self.address)
             self.inst.timeout = int(self.timeout * 1000)  # ms
             self.inst.write_termination = self.terminator
@@ -37,7 +53,7 @@ class VisaConnection(ConnectionInterface):
         try:
             self.inst.write(command)
         except pyvisa.VisaIOError as e:
-            raise ConnectionIOError(f"VISA write error: {e}")
+            raise _visa_error('write', e)
 
     def read(self) -> str:
         if not self.is_connected():
@@ -45,7 +61,15 @@ class VisaConnection(ConnectionInterface):
         try:
             return self.inst.read().strip()
         except pyvisa.VisaIOError as e:
-            raise ConnectionIOError(f"VISA read error: {e}")
+            raise _visa_error('read', e)
+
+    def _read_exact(self, size: int) -> bytes:
+        if not self.is_connected():
+            raise ConnectionClosedError("VISA not connected")
+        try:
+            return self.inst.read_bytes(size)
+        except pyvisa.VisaIOError as e:
+            raise _visa_error('read', e)
 
     def query(self, command: str) -> str:
         if not self.is_connected():
@@ -53,7 +77,7 @@ class VisaConnection(ConnectionInterface):
         try:
             return self.inst.query(command).strip()
         except pyvisa.VisaIOError as e:
-            raise ConnectionIOError(f"VISA query error: {e}")
+            raise _visa_error('query', e)
 
     def is_connected(self) -> bool:
         return self.inst is not None
@@ -1,44 +1,93 @@
+import queue
+import threading
 import time
+from concurrent.futures import Future
 from ..interfaces import ConnectionInterface
+from ..interfaces.connection import ConnectionTimeoutError
 
 class CommonSCPI:
+    __slots__ = ('conn', '_idn_cache', '_opt_cache', '_pending', '_async_queue', '_async_thread')
+
+    # IEEE 488.2 common commands. Kept as str: ConnectionInterface.write/query take
+    # str and each backend appends its own terminator (pyvisa encodes internally),
+    # and held commands are joined with ';' before sending.
+    _IDN = "*IDN?"
+    _RST = "*RST"
+    _CLS = "*CLS"
+    _OPC = "*OPC"
+    _OPC_Q = "*OPC?"
+    _ESR_Q = "*ESR?"
+    _STB_Q = "*STB?"
+    _SRE_Q = "*SRE?"
+    _ESE_Q = "*ESE?"
+    _OPT_Q = "*OPT?"
+    _PSC_Q = "*PSC?"
+    _TRG = "*TRG"
+    _TST_Q = "*TST?"
+    _WAI = "*WAI"
+
+    # Command headers this wrapper sends, long form with the short form in upper case
+    # ('?' marks a query). Subclasses list their own; scpi_shell --strict accepts the union.
+    SCPI_COMMANDS = (
+        "*IDN?", "*RST", "*CLS", "*OPC", "*OPC?", "*ESR?", "*STB?", "*SRE", "*SRE?",
+        "*ESE", "*ESE?", "*OPT?", "*PSC", "*PSC?", "*RCL", "*SAV", "*TRG", "*TST?", "*WAI",
+    )
+
     def __init__(self, connection: ConnectionInterface):
         self.conn = connection
+        # Responses to device-constant queries, filled on first call
+        self._idn_cache = None
+        self._opt_cache = None
+        # header -> value of setter commands held back by hold(); None when not holding
+        self._pending = None
+        # Background completion worker for send_async, started on first use
+        self._async_queue = None
+        self._async_thread = None
 
     def __enter__(self):
         self.conn.__enter__()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop_async()
         self.conn.__exit__(exc_type, exc_val, exc_tb)
 
+    def disconnect(self):
+        """Stop the send_async worker and close the connection (for wrappers used without a with block)"""
+        self.stop_async()
+        self.conn.disconnect()
+
     def idn(self):
-        """*IDN? Identification query"""
-        return self.conn.query("*IDN?")
+        """*IDN? Identification query (cached after the first call)"""
+        if self._idn_cache is None:
+            self._idn_cache = self._query(self._IDN)
+        return self._idn_cache
 
     def reset(self):
         """*RST Reset instrument"""
-        self.conn.write("*RST")
+        self._idn_cache = None
+        self._opt_cache = None
+        self.conn.write(self._RST)
 
     def clear_status(self):
         """*CLS Clear status"""
-        self.conn.write("*CLS")
+        self.conn.write(self._CLS)
 
     def opc(self):
         """*OPC Set operation complete bit"""
-        self.conn.write("*OPC")
+        self.conn.write(self._OPC)
 
     def opc_query(self):
         """*OPC? Wait for operation complete"""
-        return self.conn.query("*OPC?")
+        return self._query(self._OPC_Q)
 
     def esr_query(self):
         """*ESR? Read standard event status register"""
-        return self.conn.query("*ESR?")
+        return self._query(self._ESR_Q)
 
     def stb_query(self):
         """*STB? Read status byte"""
-        return self.conn.query("*STB?")
+        return self._query(self._STB_Q)
 
     def sre(self, value):
         """*SRE Set service request enable register"""
@@ -46,7 +95,7 @@ class CommonSCPI:
 
     def sre_query(self):
         """*SRE? Query service request enable register"""
-        return self.conn.query("*SRE?")
+        return self._query(self._SRE_Q)
 
     def ese(self, value):
         """*ESE <data> Set standard event status enable register"""
@@ -54,11 +103,13 @@ class CommonSCPI:
 
     def ese_query(self):
         """*ESE? Query standard event status enable register"""
-        return self.conn.query("*ESE?")
+        return self._query(self._ESE_Q)
 
     def opt_query(self):
-        """*OPT? Query installed options"""
-        return self.conn.query("*OPT?")
+        """*OPT? Query installed options (cached after the first call)"""
+        if self._opt_cache is None:
+            self._opt_cache = self._query(self._OPT_Q)
+        return self._opt_cache
 
     def psc(self, value):
         """*PSC ON|OFF|1|0 Set power-on status clear"""
@@ -66,7 +117,7 @@ class CommonSCPI:
 
     def psc_query(self):
         """*PSC? Query power-on status clear setting"""
-        return self.conn.query("*PSC?")
+        return self._query(self._PSC_Q)
 
     def rcl(self, filename):
         """*RCL "<filename>" Recall configuration from file"""
@@ -78,15 +129,15 @@ class CommonSCPI:
 
     def trg(self):
         """*TRG Trigger instrument"""
-        self.conn.write("*TRG")
+        self.conn.write(self._TRG)
 
     def tst_query(self):
         """*TST? Self-test query"""
-        return self.conn.query("*TST?")
+        return self._query(self._TST_Q)
 
     def wai(self):
         """*WAI Wait-to-continue"""
-        self.conn.write("*WAI")
+        self.conn.write(self._WAI)
 
     # SCPI Comunication Func
 
@@ -97,52 +148,153 @@ class CommonSCPI:
         return self.conn.read()
 
     def query(self, command: str) -> str:
-        return self.query(command)
+        return self._query(command)
+
+    def _query(self, command: str) -> str:
+        """conn.query after sending any setter commands held by hold(), so the response reflects them"""
+        if self._pending:
+            self.flush()
+        return self.conn.query(command)
+
+    def hold(self):
+        """
+        Start holding setter commands sent through set() instead of writing them.
+        A later set() of the same header replaces the held value, so only the last one is sent.
+        Any query sent through this wrapper flushes the held commands first.
+        """
+        if self._pending is None:
+            self._pending = {}
+
+    def flush(self, safe: bool = True, timeout=5.0):
+        """Send held setter commands as one compound message and stop holding"""
+        pending, self._pending = self._pending, None
+        if pending:
+            self.send_many([f"{header} {value}" for header, value in pending.items()], safe=safe, timeout=timeout)
+
+    def set(self, header: str, value, timeout=5.0):
+        """Send '<header> <value>' with s_send, or hold it until flush() while holding"""
+        pending = self._pending
+        if pending is None:
+            self.s_send(f"{header} {value}", timeout)
+        else:
+            # Re-insert so the held command keeps the order of the latest set()
+            pending.pop(header, None)
+            pending[header] = value
+
+    def send_many(self, commands: list[str], safe: bool = False, compound: bool = True, timeout=5.0) -> None:
+        """
+        Send several SCPI commands as one ';'-joined program message (one write).
+        safe=True waits for completion and checks errors like s_send.
+        compound=False writes the commands one by one for instruments/drivers without compound message support.
+        """
+        if self._pending:
+            self.flush()
+        if compound:
+            self.conn.write(";".join(commands))
+        else:
+            for command in commands:
+                self.conn.write(command)
+        if safe:
+            self._wait_complete(timeout)
+
+    def query_many(self, commands: list[str], compound: bool = True) -> list[str]:
+        """
+        Send several SCPI queries as one ';'-joined program message and split the
+        ';'-separated response, costing one round-trip instead of len(commands).
+        Responses that themselves contain ';' cannot be split reliably.
+        compound=False pipelines the queries as separate messages instead.
+        """
+        if self._pending:
+            self.flush()
+        if not compound:
+            return self.conn.query_pipelined(commands)
+        return self.conn.query(";".join(commands)).split(";")
 
     def s_send(self, command, timeout=5.0, interval=0.1):
         """
-        Send a SCPI command. If safe=True, monitors completion and errors using *OPC and *ESR?.
+        Send a SCPI command, then wait for completion with *OPC? and check errors with *ESR?.
+        timeout=0.0 waits indefinitely. interval is kept for backward compatibility (no polling).
         """
+        if self._pending:
+            self.flush()
         self.conn.write(command)
-        self.conn.write("*OPC")
-        start = time.time()
-        while True:
-            esr_str = self.conn.query("*ESR?")
-            try:
-                esr = int(esr_str)
-            except Exception:
-                raise SCPIError(-1, f"Failed to parse ESR value: '{esr_str}'")
-            if esr & 0b10:  # Operation Complete (bit 1)
-                if esr & ~0b10:
-                    raise SCPIError(esr)
-                break
-            if timeout != 0.0:
-                if time.time() - start > timeout:
-                    raise TimeoutError("SCPI command did not complete in time (OPC/ESR)")
-            time.sleep(interval)
+        self._wait_complete(timeout)
 
     def s_query(self, command, timeout=5.0, interval=0.1):
         """
-        Send a SCPI query command and get the response. If safe=True, monitors completion and errors using *OPC and *ESR?.
+        Send a SCPI query command and get the response, then wait for completion with *OPC? and check errors with *ESR?.
+        timeout=0.0 waits indefinitely. interval is kept for backward compatibility (no polling).
+        """
+        response = self._query(command)
+        self._wait_complete(timeout)
+        return response
+
+    def send_async(self, command, timeout=5.0) -> Future:
+        """
+        Queue a command to be sent like s_send by a background thread and return a Future
+        that resolves when *OPC?/*ESR? report completion (or raises SCPIError/TimeoutError).
+        Commands run in submission order. The worker uses the same connection without locking,
+        so writes and queries issued from the caller's thread (through this wrapper or the
+        connection) race with its *OPC?/*ESR? exchange; wait for the returned futures first.
+        The worker runs until stop_async(), disconnect() or the end of a with block.
         """
-        response = self.conn.query(command)
-        self.conn.write("*OPC")
+        if self._async_thread is None:
+            self._async_queue = queue.Queue()
+            self._async_thread = threading.Thread(target=self._async_worker, name="scpi-send-async", daemon=True)
+            self._async_thread.start()
+        future = Future()
+        self._async_queue.put((command, timeout, future))
+        return future
+
+    def _async_worker(self):
+        """Run queued send_async commands until the None sentinel"""
+        while True:
+            item = self._async_queue.get()
+            if item is None:
+                return
+            command, timeout, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                self.s_send(command, timeout)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+
+    def stop_async(self):
+        """Finish queued send_async commands and stop the worker thread"""
+        if self._async_thread is not None:
+            self._async_queue.put(None)
+            self._async_thread.join()
+            self._async_thread = None
+            self._async_queue = None
+
+    def _wait_complete(self, timeout):
+        """Block on *OPC? until pending operations finish, then raise SCPIError if *ESR? reports an error"""
+        self.conn.write(self._OPC_Q)
         start = time.time()
+        delay = 0.001
         while True:
-            esr_str = self.conn.query("*ESR?")
             try:
-                esr = int(esr_str)
-            except Exception:
-                raise SCPIError(-1, f"Failed to parse ESR value: '{esr_str}'")
-            if esr & 0b10:  # Operation Complete (bit 1)
-                if esr & ~0b10:
-                    raise SCPIError(esr)
-                break
-            if timeout != 0.0:
-                if time.time() - start > timeout:
-                    raise TimeoutError("SCPI command did not complete in time (OPC/ESR)")
-            time.sleep(interval)
-        return response
+                # The instrument answers *OPC? only once all pending operations are done
+                if self.conn.read():
+                    break
+            except ConnectionTimeoutError:
+                pass
+            else:
+                # Empty line without a timeout: back off instead of spinning on read()
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+            if timeout != 0.0 and time.time() - start > timeout:
+                raise TimeoutError("SCPI command did not complete in time (*OPC?)")
+        esr_str = self.conn.query(self._ESR_Q)
+        try:
+            esr = int(esr_str)
+        except Exception:
+            raise SCPIError(-1, f"Failed to parse ESR value: '{esr_str}'")
+        if esr & ~0b11:  # Anything beyond Operation Complete / Request Control
+            raise SCPIError(esr)
 
 class SCPIError(Exception):
     """
@@ -1,59 +1,97 @@
+import os
 from typing import Optional, Union
-from .core.connection_factory import create_connection, create_raw_connection
+from .core.connection_factory import create_connection, _validate_method, clear_connection_pool, get_pool_size, on_connection_event
 from .core.scpi.common_scpi import CommonSCPI
 from .core.interfaces import ConnectionInterface
 from .registry import registry
-from .stub_manager import stub_manager
+from .stub_manager import get_stub_manager
 
 # Auto-discover plugins on module import
 registry.auto_discover("lab_instruments/plugins")
 
-# Update stub file if needed
-stub_manager.update_stub_if_needed()
+# Update stub file if needed (set LAB_INSTRUMENTS_STUBS=0 to skip, e.g. for deployed scripts)
+if os.environ.get("LAB_INSTRUMENTS_STUBS", "1") != "0":
+    get_stub_manager().update_stub_if_needed()
 
-def _connect_device_via_registry(dev: str, method: Optional[str] = None, **kwargs) -> CommonSCPI:
+def _connect_device_via_registry(dev: str, method: Optional[str] = None, config: Optional[dict] = None, use_pool: bool = False, **kwargs) -> CommonSCPI:
     """Connect to device using registry information"""
-    device_info = registry.get_device_info(dev.lower())
+    device_info = registry.resolve(dev)
     if not device_info:
         raise ValueError(f'Device "{dev}" not found in registry. Available devices: {registry.list_devices()}')
     
-    # Use config from registry
-    config = device_info.config
+    # Use config from registry unless the caller supplied one
+    if config is None:
+        config = device_info.config
     device_class = device_info.device_class
     
     # Create connection using config and user parameters
     effective_method = method or config.get('method', '')
-    conn = create_connection(effective_method, config, kwargs)
+    conn = create_connection(effective_method, config, kwargs, use_pool)
     
     # Return typed instance
     return device_class(conn)
 
-def connect(dev: Optional[str] = None, method: Optional[str] = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> Union[CommonSCPI, ConnectionInterface]:
+def connect(dev: Optional[str] = None, method: Optional[str] = None, plugins_dir: str = "lab_instruments/plugins", *, config: Optional[dict] = None, use_pool: bool = False, **kwargs) -> Union[CommonSCPI, ConnectionInterface]:
     """
     Factory function to initialize and return an appropriate SCPI wrapper instance or connection interface.
     
     - If dev is specified, loads device from registry and returns the typed SCPI wrapper.
     - If dev is not specified, returns a raw connection interface using method and kwargs.
     - User-supplied kwargs override config file parameters.
+    - config may be a preloaded config dict (same schema as config.json) to skip config file loading.
+    - use_pool=True shares one open connection per endpoint across connect() calls (see clear_connection_pool).
     - plugins_dir parameter is maintained for backward compatibility but registry is used internally.
     
     This function supports automatic type inference through generated stub files.
     """
     if dev:
-        return _connect_device_via_registry(dev, method, **kwargs)
-    else:
-        return create_raw_connection(method, **kwargs)
+        return _connect_device_via_registry(dev, method, config, use_pool, **kwargs)
+    # Validate once so a bad method raises the same error whichever options are given
+    comm_method = _validate_method(method or (config.get('method', '') if config else ''))
+    return create_connection(comm_method, config, kwargs, use_pool)
+
+def acquire(dev: Optional[str] = None, method: Optional[str] = None, **kwargs) -> Union[CommonSCPI, ConnectionInterface]:
+    """connect() and open the connection without a with block; pair every call with release()"""
+    return connect(dev, method, **kwargs).__enter__()
+
+def release(instance: Union[CommonSCPI, ConnectionInterface]) -> None:
+    """Close a connection opened by acquire() (pooled connections stay open for reuse)"""
+    instance.__exit__(None, None, None)
 
 def list_devices() -> list[str]:
     """Get list of available devices"""
     return registry.list_devices()
 
+def on_device_change(callback):
+    """Register callback() to be called whenever devices are registered or the registry is cleared"""
+    return registry.add_change_listener(callback)
+
+def _typed_connect_getattr(module_globals: dict):
+    """
+    Build a module __getattr__ resolving connect_<dev> to registry typed connect functions.
+    Results are cached in module_globals so later lookups bypass __getattr__, and dropped
+    when the registry changes so the next lookup resolves against the current registry.
+    """
+    cached = set()
+    
+    def __getattr__(name: str):
+        """Dynamic attribute access for typed connect functions"""
+        if name.startswith('connect_'):
+            device_name = name[8:]  # Remove 'connect_' prefix
+            typed_connect = registry.get_typed_connect(device_name)
+            if typed_connect:
+                module_globals[name] = typed_connect
+                cached.add(name)
+                return typed_connect
+        raise AttributeError(f"module '{module_globals['__name__']}' has no attribute '{name}'")
+    
+    @registry.add_change_listener
+    def _drop_cached_connects():
+        for name in cached:
+            module_globals.pop(name, None)
+        cached.clear()
+    
+    return __getattr__
+
 # Export typed connect functions for each registered device
-def __getattr__(name: str):
-    """Dynamic attribute access for typed connect functions"""
-    if name.startswith('connect_'):
-        device_name = name[8:]  # Remove 'connect_' prefix
-        typed_connect = registry.get_typed_connect(device_name)
-        if typed_connect:
-            return typed_connect
-    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+__getattr__ = _typed_connect_getattr(globals())
@@ -1,8 +1,77 @@
+from functools import lru_cache
 from ...core.scpi.common_scpi import CommonSCPI
 
+@lru_cache(maxsize=None)
+def _param_header(idx):
+    """':PARameter<idx>' header, built once per index"""
+    return f":PARameter{idx}"
+
+def _changes_settings(message):
+    """True unless every ';'-separated unit of the program message is a query"""
+    return not all(unit.rstrip().endswith("?") for unit in message.split(";"))
+
+class _InvalidatingConnection:
+    """Connection wrapper that clears a settings cache whenever a non-query message is sent"""
+    __slots__ = ('_conn', '_cache')
+
+    def __init__(self, conn, cache):
+        self._conn = conn
+        self._cache = cache
+
+    def write(self, command):
+        if _changes_settings(command):
+            self._cache.clear()
+        self._conn.write(command)
+
+    def query(self, command):
+        if _changes_settings(command):
+            self._cache.clear()
+        return self._conn.query(command)
+
+    def query_pipelined(self, commands):
+        if any(map(_changes_settings, commands)):
+            self._cache.clear()
+        return self._conn.query_pipelined(commands)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
 class IM3590SCPI(CommonSCPI):
+    __slots__ = ('_query_cache',)
+
+    # IM3590 commands
+    _RANGE = ":RANGe"
+    _RANGE_Q = ":RANGe?"
+    _SPEED = ":SPEEd"
+    _SPEED_Q = ":SPEEd?"
+    _FREQ = ":FREQuency"
+    _FREQ_Q = ":FREQuency?"
+    _MEAS_Q = ":MEASure?"
+    _MODE = ":MODE"
+    _MODE_Q = ":MODE?"
+
+    SCPI_COMMANDS = (
+        ":PARameter", ":PARameter?", ":RANGe", ":RANGe?", ":SPEEd", ":SPEEd?",
+        ":FREQuency", ":FREQuency?", ":MEASure?", ":MODE", ":MODE?",
+    )
+
     def __init__(self, connection):
-        super().__init__(connection)
+        # query -> last response of get_* settings queries; cleared whenever a non-query message is sent
+        self._query_cache = {}
+        super().__init__(_InvalidatingConnection(connection, self._query_cache))
+
+    def _cached_query(self, command):
+        """s_query with the response kept until a setting is changed through this driver"""
+        if self._pending:
+            self.flush()
+        cache = self._query_cache
+        if command not in cache:
+            cache[command] = self.s_query(command)
+        return cache[command]
+
+    def invalidate_cache(self):
+        """Forget cached settings, e.g. after changing them from the front panel or the raw connection"""
+        self._query_cache.clear()
 
     def set_parameter(self, idx, param):
         """
@@ -10,7 +79,7 @@ class IM3590SCPI(CommonSCPI):
         :param idx: Parameter index (1, 2, ...)
         :param param: Parameter string (e.g. Z, Y, PHASE, etc.)
         """
-        self.s_send(f":PARameter{idx} {param}")
+        self.set(_param_header(idx), param)
 
     def get_parameter(self, idx):
         """
@@ -18,68 +87,85 @@ class IM3590SCPI(CommonSCPI):
         :param idx: Parameter index (1, 2, ...)
         :return: Parameter string
         """
-        return self.s_query(f":PARameter{idx}?")
+        return self._cached_query(_param_header(idx) + "?")
 
     def set_range(self, range_no):
         """
         Set measurement range.
         :param range_no: Range number
         """
-        self.s_send(f":RANGe {range_no}")
+        self.set(self._RANGE, range_no)
 
     def get_range(self):
         """
         Query measurement range.
         :return: Range number
         """
-        return self.s_query(":RANGe?")
+        return self._cached_query(self._RANGE_Q)
 
     def set_speed(self, speed):
         """
         Set measurement speed (e.g. FAST, MEDium, SLOW, SLOW2).
         :param speed: Speed string
         """
-        self.s_send(f":SPEEd {speed}")
+        self.set(self._SPEED, speed)
 
     def get_speed(self):
         """
         Query measurement speed.
         :return: Speed string
         """
-        return self.s_query(":SPEEd?")
+        return self._cached_query(self._SPEED_Q)
 
     def set_freq(self, freq):
         """
         Set measurement frequency.
         :param freq: Frequency value (Hz)
         """
-        self.s_send(f":FREQuency {freq}")
+        self.set(self._FREQ, freq)
 
     def get_freq(self):
         """
         Query measurement frequency.
         :return: Frequency value (Hz)
         """
-        return self.s_query(":FREQuency?")
+        return self._cached_query(self._FREQ_Q)
 
     def measure(self):
         """
         Query measurement value.
         :return: Measurement result string
         """
-        return self.s_query(":MEASure?")
+        return self.s_query(self._MEAS_Q)
 
     def set_mode(self, mode):
         """
         Set measurement mode (e.g. LCR, ANALyzer, CONTinuous).
         :param mode: Mode string
         """
-        self.s_send(f":MODE {mode}")
+        self.set(self._MODE, mode)
+
+    def configure(self, *, mode=None, freq=None, speed=None, range_no=None, timeout=5.0):
+        """
+        Apply several settings as one ';'-chained message, e.g. ':MODE LCR;:FREQuency 1000;:SPEEd FAST'.
+        Settings left as None are not sent. Waits for completion and checks errors like s_send.
+        """
+        parts = []
+        if mode is not None:
+            parts.append(f"{self._MODE} {mode}")
+        if freq is not None:
+            parts.append(f"{self._FREQ} {freq}")
+        if speed is not None:
+            parts.append(f"{self._SPEED} {speed}")
+        if range_no is not None:
+            parts.append(f"{self._RANGE} {range_no}")
+        if parts:
+            self.send_many(parts, safe=True, timeout=timeout)
 
     def get_mode(self):
         """
         Query measurement mode.
         :return: Mode string
         """
-        return self.s_query(":MODE?")
+        return self._cached_query(self._MODE_Q)
 
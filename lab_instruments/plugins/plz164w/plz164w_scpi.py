@@ -1,6 +1,13 @@
 from ...core.scpi.common_scpi import CommonSCPI
 
 class PLZ164WSCPI(CommonSCPI):
+    __slots__ = ()
+
+    SCPI_COMMANDS = (
+        "OUTPut", "VOLTage", "CURRent", "POWer:PROTection",
+        "MEASure:VOLTage?", "MEASure:CURRent?", "SYSTem:LOCal",
+    )
+
     def __init__(self, connection):
         super().__init__(connection)
 
@@ -11,13 +18,13 @@ class PLZ164WSCPI(CommonSCPI):
         self.s_send("OUTP OFF")
 
     def set_voltage(self, voltage) -> None:
-        self.s_send(f"VOLT {voltage}")
+        self.set("VOLT", voltage)
 
     def set_current(self, current) -> None:
-        self.s_send(f"CURR {current}")
+        self.set("CURR", current)
 
     def set_over_power_protection(self, power) -> None:
-        self.s_send(f"POW:PROT {power}")
+        self.set("POW:PROT", power)
 
     def get_voltage(self) -> float:
         res = self.s_query("MEAS:VOLT?")
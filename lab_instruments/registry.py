@@ -1,68 +1,278 @@
-from typing import Dict, Type, TypeVar, Generic, cast, Optional, Any, Callable
+from typing import Dict, Type, TypeVar, Generic, Optional, Any, Callable, Union
 from pathlib import Path
+import functools
 import importlib
+import importlib.util
+import re
+import inspect
 import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from .core.scpi.common_scpi import CommonSCPI
+from .core.connection_factory import create_connection, load_config_file
 
 T = TypeVar('T', bound=CommonSCPI)
 
 # Configure logging
 logger = logging.getLogger(__name__)
+
+# Resolved plugin SCPI classes keyed by (device name, plugins directory)
+_SCPI_CLASS_CACHE: Dict[tuple[str, str], type] = {}
+
+# Plugin directories already inserted into sys.path by import_scpi_class (as given and absolute)
+_INJECTED_PLUGIN_DIRS: set[str] = set()
+
+# Imported plugin modules keyed by module path
+_MODULE_CACHE: Dict[str, ModuleType] = {}
+
+def _add_plugins_dir_to_path(plugins_dir: str) -> None:
+    """Insert a plugins directory into sys.path once"""
+    if plugins_dir in _INJECTED_PLUGIN_DIRS:
+        return
+    abs_plugins_dir = os.path.abspath(plugins_dir)
+    if abs_plugins_dir not in _INJECTED_PLUGIN_DIRS and abs_plugins_dir not in sys.path:
+        sys.path.insert(0, abs_plugins_dir)
+    _INJECTED_PLUGIN_DIRS.add(plugins_dir)
+    _INJECTED_PLUGIN_DIRS.add(abs_plugins_dir)
+
+def _import_plugin_module(module_path: str) -> ModuleType:
+    """Import a plugin module, memoized so repeat imports skip the import machinery"""
+    module = _MODULE_CACHE.get(module_path)
+    if module is None:
+        module = _MODULE_CACHE[module_path] = importlib.import_module(module_path)
+    return module
+
+# Derived names per device: name -> (interned name, connect function name, SCPI class name)
+_NAME_CACHE: Dict[str, tuple[str, str, str]] = {}
+
+def _device_names(dev: str) -> tuple[str, str, str]:
+    """Get the interned device name with its connect_<dev> and <DEV>SCPI names, built once per name"""
+    names = _NAME_CACHE.get(dev)
+    if names is None:
+        interned = sys.intern(dev)
+        names = _NAME_CACHE[interned] = (interned, sys.intern(f"connect_{dev}"), sys.intern(f"{dev.upper()}SCPI"))
+    return names
+
+def import_scpi_class(dev: str, plugins_dir: str) -> Type[CommonSCPI]:
+    """Import a plugin's SCPI class, memoized so repeated lookups skip importlib"""
+    key = (dev, str(plugins_dir))
+    device_class = _SCPI_CLASS_CACHE.get(key)
+    if device_class is not None:
+        return device_class
+    
+    _add_plugins_dir_to_path(key[1])
+    
+    # Dynamic import
+    module = _import_plugin_module(f"lab_instruments.plugins.{dev}.{dev}_scpi")
+    
+    # Get SCPI class
+    class_name = _device_names(dev)[2]
+    device_class = getattr(module, class_name)
+    
+    _SCPI_CLASS_CACHE[key] = device_class
+    return device_class
+
+# Device method lists persisted by the stub manager: "module.Class" -> {'mtime': ..., 'version': ..., 'methods': [...]}
+_METHOD_CACHE: Dict[str, dict] = {}
+# Bumped when the method list format changes (2: inherited methods included), invalidating persisted entries
+_METHOD_CACHE_VERSION = 2
+# Inherited methods come from CommonSCPI, so its source mtime is part of every cache entry's mtime
+_COMMON_SCPI_FILE = inspect.getfile(CommonSCPI)
+
+_PACKAGE_PREFIX = 'lab_instruments.'
+
+@functools.lru_cache(maxsize=None)
+def _to_relative(module: str) -> str:
+    """Convert an absolute lab_instruments module path to a package-relative one"""
+    return '.' + module.removeprefix(_PACKAGE_PREFIX) if module.startswith(_PACKAGE_PREFIX) else module
+
+# Result of the last plugin directory scan, reused while the directory mtimes are unchanged
+_MANIFEST_FILE = Path(__file__).parent / ".plugin_manifest.json"
+
+def _scan_plugins(plugins_dir: str) -> list[dict]:
+    """List plugin candidate directories with their mtime and which plugin files they contain"""
+    entries = []
+    with os.scandir(plugins_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name[0] == '.' or not entry.is_dir():
+                continue
+            has_scpi, has_config = _plugin_files(entry.path, name)
+            entries.append({
+                'name': name,
+                'mtime': entry.stat().st_mtime,
+                'has_scpi': has_scpi,
+                'has_config': has_config,
+            })
+    return entries
+
+def _plugin_files(device_dir: str, device_name: str) -> tuple[bool, bool]:
+    """Check for <name>_scpi.py and config.json with a single directory read"""
+    with os.scandir(device_dir) as it:
+        files = {entry.name for entry in it if entry.is_file()}
+    return f"{device_name}_scpi.py" in files, "config.json" in files
+
+def _load_manifest(plugins_dir: str) -> Optional[list[dict]]:
+    """Return the cached scan for plugins_dir, or None if missing or any directory changed since"""
+    try:
+        with open(_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('plugins_dir') != plugins_dir or manifest.get('mtime') != os.stat(plugins_dir).st_mtime:
+            return None
+        entries = manifest['plugins']
+        for entry in entries:
+            if os.stat(os.path.join(plugins_dir, entry['name'])).st_mtime != entry['mtime']:
+                return None
+        return entries
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _save_manifest(plugins_dir: str, entries: list[dict]) -> None:
+    """Save a plugin scan for _load_manifest (best effort; the package dir may be read-only)"""
+    try:
+        manifest = {
+            'plugins_dir': plugins_dir,
+            'mtime': os.stat(plugins_dir).st_mtime,
+            'plugins': entries,
+        }
+        with open(_MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+    except OSError as e:
+        logger.debug(f"Failed to save plugin manifest: {e}")
+
+class _LazyDeviceClass:
+    """Placeholder for a plugin SCPI class that is imported on first use"""
+    def __init__(self, dev: str, plugins_dir: str):
+        self.dev = dev
+        self.plugins_dir = plugins_dir
+        # Same name/module the imported class will have, for logging, docs and stubs
+        self.__name__ = _device_names(dev)[2]
+        self.module_path = f"lab_instruments.plugins.{dev}.{dev}_scpi"
+    
+    def load(self) -> Type[CommonSCPI]:
+        return import_scpi_class(self.dev, self.plugins_dir)
+    
+    def check(self) -> None:
+        """Cheap registration-time check that the module resolves and defines the class, without importing it"""
+        _add_plugins_dir_to_path(self.plugins_dir)
+        if importlib.util.find_spec(self.module_path) is None:
+            raise ImportError(f"No module named '{self.module_path}'")
+        scpi_file = os.path.join(self.plugins_dir, self.dev, f"{self.dev}_scpi.py")
+        with open(scpi_file, 'r', encoding='utf-8') as f:
+            source = f.read()
+        if not re.search(rf"^class {self.__name__}\b", source, re.MULTILINE):
+            raise AttributeError(f"{scpi_file} does not define class '{self.__name__}'")
+
 class DeviceInfo:
     """Device information storage class"""
-    def __init__(self, name: str, device_class: Type[CommonSCPI], config_path: Optional[str] = None, 
+    def __init__(self, name: str, device_class: Union[Type[CommonSCPI], _LazyDeviceClass], config_path: Optional[str] = None, 
                  plugin_path: Optional[str] = None, discovered_at: Optional[datetime] = None):
         self.name = name
-        self.device_class = device_class
+        self._device_class = device_class
         self.config_path = config_path
         self.plugin_path = plugin_path
         self.discovered_at = discovered_at or datetime.now()
         self._config = None
         self._metadata = None
+        self._methods = None
+    
+    @property
+    def device_class(self) -> Type[CommonSCPI]:
+        """Device SCPI class (imports the plugin module on first access if registered lazily)"""
+        device_class = self._device_class
+        if isinstance(device_class, _LazyDeviceClass):
+            device_class = self._device_class = device_class.load()
+        return device_class
+    
+    @property
+    def class_module(self) -> str:
+        """Module of the device class, without importing a lazily registered plugin"""
+        device_class = self._device_class
+        if isinstance(device_class, _LazyDeviceClass):
+            return device_class.module_path
+        return device_class.__module__
     
     @property
     def config(self) -> dict:
-        """Lazy load configuration file"""
+        """Lazy load configuration file (see reload_config to pick up changes)"""
         if self._config is None and self.config_path:
             try:
-                with open(self.config_path) as f:
-                    self._config = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
+                self._config = load_config_file(self.config_path)
+            except (ValueError, OSError):
                 self._config = {}
         return self._config or {}
     
+    def reload_config(self) -> dict:
+        """Re-read the configuration file if it changed on disk since it was parsed"""
+        self._config = None
+        return self.config
+    
     @property
     def metadata(self) -> dict:
         """Get device metadata"""
         if self._metadata is None:
-            self._metadata = {
-                'name': self.name,
-                'class_name': self.device_class.__name__,
-                'module': self.device_class.__module__,
-                'config_path': self.config_path,
-                'plugin_path': self.plugin_path,
-                'discovered_at': self.discovered_at.isoformat(),
-                'has_config': bool(self.config_path and os.path.exists(self.config_path)),
-                'methods': self._get_device_methods()
-            }
+            self._metadata = self.get_metadata()
         return self._metadata
     
+    def get_metadata(self, fields: Optional[set[str]] = None) -> dict:
+        """Build device metadata; with fields, only those keys are computed (e.g. skip 'methods')"""
+        getters = self._METADATA_FIELDS
+        if fields is not None:
+            getters = {key: getter for key, getter in getters.items() if key in fields}
+        return {key: getter(self) for key, getter in getters.items()}
+    
+    @property
+    def methods(self) -> list:
+        """Device-specific methods (computed on first access, or reused from the method cache)"""
+        if self._methods is None:
+            key = f"{self.class_module}.{self._device_class.__name__}"
+            mtime = self._source_mtime()
+            cached = _METHOD_CACHE.get(key)
+            if (mtime is not None and cached is not None and cached.get('mtime') == mtime
+                    and cached.get('version') == _METHOD_CACHE_VERSION):
+                self._methods = cached['methods']
+            else:
+                self._methods = self._get_device_methods()
+                if mtime is not None:
+                    _METHOD_CACHE[key] = {'mtime': mtime, 'version': _METHOD_CACHE_VERSION, 'methods': self._methods}
+        return self._methods
+    
+    def _source_mtime(self) -> Optional[float]:
+        """Newest mtime of the plugin's <name>_scpi.py and CommonSCPI's source (None for devices not loaded from a plugin dir)"""
+        if not self.plugin_path:
+            return None
+        try:
+            return max(os.stat(os.path.join(self.plugin_path, f"{self.name}_scpi.py")).st_mtime,
+                       os.stat(_COMMON_SCPI_FILE).st_mtime)
+        except OSError:
+            return None
+    
     def _get_device_methods(self) -> list:
-        """Get list of device-specific methods"""
-        methods = []
-        for attr_name in dir(self.device_class):
-            if not attr_name.startswith('_'):
-                attr = getattr(self.device_class, attr_name)
-                if callable(attr):
-                    methods.append({
-                        'name': attr_name,
-                        'doc': getattr(attr, '__doc__', '').strip() if hasattr(attr, '__doc__') else ''
-                    })
-        return methods
+        """Get list of public methods of the device class, including inherited ones (sorted by name, like dir())"""
+        methods = {}
+        for klass in self.device_class.__mro__[:-1]:  # Skip object
+            for attr_name, attr in vars(klass).items():
+                if attr_name.startswith('_') or attr_name in methods:
+                    continue
+                if callable(attr) or isinstance(attr, (classmethod, staticmethod)):
+                    methods[attr_name] = (attr.__doc__ or '').strip()
+        return [{'name': name, 'doc': methods[name]} for name in sorted(methods)]
+    
+    _METADATA_FIELDS: Dict[str, Callable[['DeviceInfo'], Any]] = {
+        'name': lambda info: info.name,
+        'class_name': lambda info: info._device_class.__name__,
+        'module': lambda info: info.class_module,
+        'config_path': lambda info: info.config_path,
+        'plugin_path': lambda info: info.plugin_path,
+        'discovered_at': lambda info: info.discovered_at.isoformat(),
+        'has_config': lambda info: bool(info.config_path and os.path.exists(info.config_path)),
+        'methods': lambda info: info.methods,
+    }
     
     def validate_config(self) -> tuple[bool, list[str]]:
         """Validate device configuration"""
@@ -100,23 +310,57 @@ class DeviceRegistry:
     _devices: Dict[str, DeviceInfo] = {}
     _typed_connects: Dict[str, Callable] = {}
     _discovery_stats: Dict[str, Any] = {}
+    # Registration-ordered copies of _devices keys/values for the list/iterate paths
+    _names: tuple[str, ...] = ()
+    _infos: tuple[DeviceInfo, ...] = ()
+    # connect(dev=...) spellings already resolved to a DeviceInfo (hits only)
+    _resolve_cache: Dict[str, DeviceInfo] = {}
+    # Incremented on every register/clear_registry, so callers can tell when cached listings are stale
+    _version: int = 0
+    # Callbacks run after a device is registered or the registry is cleared
+    _change_listeners: list[Callable[[], None]] = []
     
     @classmethod
-    def register(cls, name: str, device_class: Type[T], config_path: Optional[str] = None, 
+    def register(cls, name: str, device_class: Union[Type[T], _LazyDeviceClass], config_path: Optional[str] = None, 
                 plugin_path: Optional[str] = None, discovered_at: Optional[datetime] = None) -> Type[T]:
-        """Register a device class"""
+        """Register a device class (or a _LazyDeviceClass to defer the plugin import)"""
+        name = _device_names(name)[0]
         device_info = DeviceInfo(name, device_class, config_path, plugin_path, discovered_at)
-        cls._devices[name] = device_info
+        if name in cls._devices:
+            cls._devices[name] = device_info
+            cls._infos = tuple(cls._devices.values())
+        else:
+            cls._devices[name] = device_info
+            cls._names = (*cls._names, name)
+            cls._infos = (*cls._infos, device_info)
+        cls._resolve_cache.clear()
         cls._typed_connects[name] = cls._create_typed_connect(name, device_class)
         
         logger.info(f"Registered device: {name} ({device_class.__name__})")
+        cls._version += 1
+        cls._notify_change()
         return device_class
     
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the set of registered devices changes"""
+        return self._version
+    
     @classmethod
     def get_device_info(cls, name: str) -> Optional[DeviceInfo]:
         """Get device information"""
         return cls._devices.get(name)
     
+    @classmethod
+    def resolve(cls, name: str) -> Optional[DeviceInfo]:
+        """Get device information for a user-supplied, case-insensitive device name"""
+        info = cls._resolve_cache.get(name)
+        if info is None:
+            info = cls._devices.get(name.lower())
+            if info is not None:
+                cls._resolve_cache[name] = info
+        return info
+    
     @classmethod
     def get_device_class(cls, name: str) -> Optional[Type[CommonSCPI]]:
         """Get device class"""
@@ -131,7 +375,15 @@ class DeviceRegistry:
     @classmethod
     def list_devices(cls) -> list[str]:
         """Get list of registered devices"""
-        return list(cls._devices.keys())
+        return list(cls._names)
+    
+    @classmethod
+    def snapshot(cls) -> tuple[tuple[str, str, str], ...]:
+        """Get (device, class name, module relative to the package) for every registered device"""
+        return tuple(
+            (name, info._device_class.__name__, _to_relative(info.class_module))
+            for name, info in zip(cls._names, cls._infos)
+        )
     
     @classmethod
     def get_device_metadata(cls, name: str) -> Optional[dict]:
@@ -140,9 +392,11 @@ class DeviceRegistry:
         return info.metadata if info else None
     
     @classmethod
-    def get_all_metadata(cls) -> Dict[str, dict]:
-        """Get metadata for all registered devices"""
-        return {name: info.metadata for name, info in cls._devices.items()}
+    def get_all_metadata(cls, fields: Optional[set[str]] = None) -> Dict[str, dict]:
+        """Get metadata for all registered devices (only the given fields if specified)"""
+        if fields is None:
+            return {name: info.metadata for name, info in zip(cls._names, cls._infos)}
+        return {name: info.get_metadata(fields) for name, info in zip(cls._names, cls._infos)}
     
     @classmethod
     def validate_device(cls, name: str) -> tuple[bool, list[str]]:
@@ -155,10 +409,18 @@ class DeviceRegistry:
     @classmethod
     def validate_all_devices(cls) -> Dict[str, tuple[bool, list[str]]]:
         """Validate all registered devices"""
-        results = {}
-        for name in cls.list_devices():
-            results[name] = cls.validate_device(name)
-        return results
+        return {name: info.validate_config() for name, info in zip(cls._names, cls._infos)}
+    
+    @classmethod
+    def get_method_cache(cls) -> Dict[str, dict]:
+        """Get method lists computed so far, keyed by "module.Class" (for persisting)"""
+        return dict(_METHOD_CACHE)
+    
+    @classmethod
+    def load_method_cache(cls, method_cache: Dict[str, dict]) -> None:
+        """Seed the method cache from persisted data; entries are ignored once their plugin file changes"""
+        for key, entry in method_cache.items():
+            _METHOD_CACHE.setdefault(key, entry)
     
     @classmethod
     def get_discovery_stats(cls) -> dict:
@@ -169,27 +431,62 @@ class DeviceRegistry:
     def clear_registry(cls):
         """Clear all registered devices (for testing)"""
         cls._devices.clear()
+        cls._names = ()
+        cls._infos = ()
         cls._typed_connects.clear()
+        cls._resolve_cache.clear()
         cls._discovery_stats.clear()
         logger.info("Registry cleared")
+        cls._version += 1
+        cls._notify_change()
+    
+    @classmethod
+    def add_change_listener(cls, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register callback() to be called whenever the set of registered devices changes"""
+        cls._change_listeners.append(callback)
+        return callback
+    
+    @classmethod
+    def _notify_change(cls):
+        for callback in cls._change_listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Registry change listener failed: {e}")
     
     @classmethod
     def _create_typed_connect(cls, name: str, device_class: Type[T]) -> Callable[..., T]:
-        """Generate typed connect function"""
-        def typed_connect(method: Optional[str] = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> T:
-            from lab_instruments.factory import connect_device
-            return cast(T, connect_device(name, method, plugins_dir, **kwargs))
+        """Generate typed connect function specialized for one device"""
+        # Resolved once here so each call skips the registry lookup and factory dispatch
+        device_info = cls._devices[name]
+        
+        def typed_connect(method: Optional[str] = None, plugins_dir: str = "lab_instruments/plugins", use_pool: bool = False,
+                          *, config: Optional[dict] = None, **kwargs) -> T:
+            # Use config from the registry unless the caller supplied one (like connect())
+            if config is None:
+                config = device_info.config
+            conn = create_connection(method or config.get('method', ''), config, kwargs, use_pool)
+            return device_info.device_class(conn)
         
         # Set function name and documentation
-        typed_connect.__name__ = f"connect_{name}"
+        typed_connect.__name__ = _device_names(name)[1]
         typed_connect.__doc__ = f"Create a typed connection to {name} device.\n\nReturns: {device_class.__name__}"
         
         return typed_connect
     
     @classmethod
-    def auto_discover(cls, plugins_dir: str = "lab_instruments/plugins") -> None:
-        """Auto-scan plugins directory and register devices"""
+    def auto_discover(cls, plugins_dir: str = "lab_instruments/plugins", use_manifest: bool = True,
+                      lazy: bool = False, max_workers: int = 4) -> None:
+        """
+        Auto-scan plugins directory and register devices (use_manifest=False forces a rescan).
+        Plugin modules are imported in parallel on up to max_workers threads, so import errors
+        are counted in the discovery stats.
+        With lazy, they are imported on first use of the device class instead; registration only
+        checks that the module resolves and defines the class, so errors raised while executing
+        the module still surface at connect time.
+        """
         discovery_start = datetime.now()
+        start_counter = time.perf_counter()
         stats = {
             'start_time': discovery_start,
             'plugins_dir': plugins_dir,
@@ -199,8 +496,7 @@ class DeviceRegistry:
             'errors': []
         }
         
-        plugins_path = Path(plugins_dir)
-        if not plugins_path.exists():
+        if not os.path.isdir(plugins_dir):
             logger.warning(f"Plugins directory not found: {plugins_dir}")
             stats['errors'].append(f"Plugins directory not found: {plugins_dir}")
             cls._discovery_stats = stats
@@ -208,61 +504,88 @@ class DeviceRegistry:
         
         logger.info(f"Starting plugin discovery in: {plugins_dir}")
         
-        for device_dir in plugins_path.iterdir():
-            if not device_dir.is_dir() or device_dir.name.startswith('.'):
-                continue
-            
+        abs_plugins_dir = os.path.abspath(plugins_dir)
+        if not lazy:
+            _add_plugins_dir_to_path(plugins_dir)
+        entries = _load_manifest(abs_plugins_dir) if use_manifest else None
+        if entries is None:
+            entries = _scan_plugins(abs_plugins_dir)
+            _save_manifest(abs_plugins_dir, entries)
+        
+        if not lazy and max_workers > 1:
+            cls._prefetch_plugins(
+                [entry['name'] for entry in entries if entry['has_scpi'] and entry['name'] not in cls._devices],
+                plugins_dir, max_workers,
+            )
+        
+        for entry in entries:
             stats['attempted'] += 1
-            success, error = cls._try_register_plugin(device_dir)
+            success, error = cls._register_plugin_entry(
+                entry['name'], plugins_dir, entry['has_scpi'], entry['has_config'], lazy, discovery_start
+            )
             if success:
                 stats['successful'] += 1
             else:
                 stats['failed'] += 1
                 if error:
-                    stats['errors'].append(f"{device_dir.name}: {error}")
+                    stats['errors'].append(f"{entry['name']}: {error}")
         
-        stats['end_time'] = datetime.now()
-        stats['duration'] = (stats['end_time'] - discovery_start).total_seconds()
+        stats['duration'] = time.perf_counter() - start_counter
+        stats['end_time'] = discovery_start + timedelta(seconds=stats['duration'])
         cls._discovery_stats = stats
         
         logger.info(f"Plugin discovery completed: {stats['successful']}/{stats['attempted']} successful")
         if stats['failed'] > 0:
             logger.warning(f"Failed to register {stats['failed']} plugins")
     
+    @staticmethod
+    def _prefetch_plugins(device_names: list[str], plugins_dir: str, max_workers: int) -> None:
+        """Import plugin SCPI classes concurrently into the import cache; failures are reported at registration"""
+        def prefetch(device_name):
+            try:
+                import_scpi_class(device_name, plugins_dir)
+            except Exception:
+                pass
+        
+        if len(device_names) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(device_names))) as executor:
+            list(executor.map(prefetch, device_names))
+    
     @classmethod
-    def _try_register_plugin(cls, device_dir: Path) -> tuple[bool, Optional[str]]:
-        """Try to register a plugin"""
+    def _try_register_plugin(cls, device_dir: Union[os.DirEntry, Path]) -> tuple[bool, Optional[str]]:
+        """Try to register a plugin from its directory (a DirEntry from os.scandir or a Path)"""
         device_name = device_dir.name
-        
+        device_path = os.fspath(device_dir)
+        try:
+            has_scpi, has_config = _plugin_files(device_path, device_name)
+        except OSError as e:
+            return False, f"Registration failed: {e}"
+        return cls._register_plugin_entry(device_name, os.path.dirname(device_path), has_scpi, has_config)
+    
+    @classmethod
+    def _register_plugin_entry(cls, device_name: str, plugins_dir: str, has_scpi: bool,
+                               has_config: bool, lazy: bool = False,
+                               discovered_at: Optional[datetime] = None) -> tuple[bool, Optional[str]]:
+        """Try to register a plugin whose file layout is already known"""
         # Skip if already registered
         if device_name in cls._devices:
             return True, None
         
+        if not has_scpi:
+            return False, "SCPI file not found"
+        
         try:
-            # Check for SCPI class file existence
-            scpi_file = device_dir / f"{device_name}_scpi.py"
-            config_file = device_dir / "config.json"
-            
-            if not scpi_file.exists():
-                return False, "SCPI file not found"
-            
-            # Add plugins directory to sys.path if needed
-            plugins_parent = device_dir.parent
-            abs_plugins_dir = os.path.abspath(plugins_parent)
-            if abs_plugins_dir not in sys.path:
-                sys.path.insert(0, abs_plugins_dir)
-            
-            # Dynamic import
-            module_path = f"lab_instruments.plugins.{device_name}.{device_name}_scpi"
-            module = importlib.import_module(module_path)
-            
-            # Get SCPI class
-            class_name = f"{device_name.upper()}SCPI"
-            device_class = getattr(module, class_name)
+            if lazy:
+                device_class = _LazyDeviceClass(device_name, plugins_dir)
+                device_class.check()
+            else:
+                device_class = import_scpi_class(device_name, plugins_dir)
             
             # Register
-            config_path = str(config_file) if config_file.exists() else None
-            cls.register(device_name, device_class, config_path, str(device_dir))
+            device_dir = os.path.join(plugins_dir, device_name)
+            config_path = os.path.join(device_dir, "config.json") if has_config else None
+            cls.register(device_name, device_class, config_path, device_dir, discovered_at)
             
             return True, None
             
@@ -1,15 +1,89 @@
-import hashlib
+import functools
+import io
 import json
 import logging
+import os
+import re
+import time
+import zlib
 from pathlib import Path
 from typing import List, Set, Optional, Tuple
 from datetime import datetime
 from .registry import registry
+from .core.connection_factory import _json_loads
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Per-device stub lines ('%' templates: module/class, device/class, device/class)
+_IMPORT_TPL = 'from %s import %s\n'
+_OVERLOAD_TPL = '@overload\ndef connect(dev: Literal["%s"], method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> %s: ...\n'
+_TYPED_CONNECT_TPL = 'def connect_%s(method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> %s: ...\n'
+
+# Fixed stub sections around the per-device lines
+_STUB_HEADER = """# Auto-generated stub file
+# Do not edit manually - this file is automatically updated
+
+from typing import Callable, overload, Union, Literal
+from .core.scpi.common_scpi import CommonSCPI, SCPIError
+from .core.interfaces import ConnectionInterface
+"""
+
+_STUB_OVERLOADS_HEADER = """
+__version__: str
+
+# Device-specific overloads
+"""
+
+_STUB_COMMON = """
+# Generic device (string)
+@overload
+def connect(dev: str, method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> CommonSCPI: ...
+
+# Direct connection (no device specified)
+@overload  
+def connect(dev: None = None, method: str = ..., plugins_dir: str = "lab_instruments/plugins", **kwargs) -> ConnectionInterface: ...
+
+def connect(dev = None, method = None, plugins_dir: str = "lab_instruments/plugins", **kwargs): ...
+
+def acquire(dev: str = None, method: str = None, **kwargs) -> Union[CommonSCPI, ConnectionInterface]: ...
+
+def release(instance: Union[CommonSCPI, ConnectionInterface]) -> None: ...
+
+def list_devices() -> list[str]: ...
+
+def clear_connection_pool() -> None: ...
+
+def get_pool_size() -> int: ...
+
+def on_connection_event(callback: Callable[[dict], None]) -> Callable[[dict], None]: ...
+
+def on_device_change(callback: Callable[[], None]) -> Callable[[], None]: ...
+
+# Typed connect functions (auto-generated)
+"""
+
+_STUB_FOOTER = """
+# Other exports
+registry: object
+CommonSCPI: type[CommonSCPI]
+SCPIError: type[SCPIError]
+"""
+
+# Bump when _generate_stub_content changes what it emits, so existing stubs are regenerated
+_STUB_GENERATOR_VERSION = 1
+# Generator version and template checksum, stored with the device signature in the cache
+_STUB_GENERATOR_SIG = "%d:%08x" % (_STUB_GENERATOR_VERSION, zlib.crc32("".join((
+    _IMPORT_TPL, _OVERLOAD_TPL, _TYPED_CONNECT_TPL,
+    _STUB_HEADER, _STUB_OVERLOADS_HEADER, _STUB_COMMON, _STUB_FOOTER,
+)).encode()))
+
+# Device names in the generated connect() overloads
+_DEVICE_RE = re.compile(r'def connect\(dev: Literal\["([^"]+)"\]')
+
 class StubManager:
     """Automatic type stub file management"""
+    # Seconds a passed should_update_stub() check is trusted while the device count is unchanged
+    CHECK_INTERVAL = 5.0
     
     def __init__(self, package_dir: Path):
         self.package_dir = package_dir
@@ -18,17 +92,27 @@ class StubManager:
         self.plugins_dir = package_dir / "plugins"
         self.backup_dir = package_dir / ".stub_backups"
         self.generation_stats = {}
-        
-        # Ensure backup directory exists
-        self.backup_dir.mkdir(exist_ok=True)
+        # Parsed cache_file contents, read once and kept in sync by _save_cache
+        self._cache: Optional[dict] = None
+        # When should_update_stub() last found the stub current, and the device count then
+        self._last_check_ts = 0.0
+        self._last_device_count = -1
+        # Plugins hash computed by the last should_update_stub(), reused by _save_cache
+        self._current_hash: Optional[str] = None
+
     
     def should_update_stub(self) -> Tuple[bool, str]:
         """Check if stub file needs updating"""
+        now = time.monotonic()
+        device_count = len(registry.list_devices())
+        if now - self._last_check_ts < self.CHECK_INTERVAL and device_count == self._last_device_count:
+            return False, "Checked recently"
+        
         if not self.stub_file.exists():
             return True, "Stub file does not exist"
         
-        # Check for changes in plugins directory
-        current_hash = self._get_plugins_hash()
+        # Check for changes in plugins directory (kept for _save_cache on the update path)
+        current_hash = self._current_hash = self._get_plugins_hash()
         cached_hash = self._get_cached_hash()
         
         if current_hash != cached_hash:
@@ -41,39 +125,70 @@ class StubManager:
         if current_devices != stub_devices:
             return True, f"Device registry mismatch (registry: {len(current_devices)}, stub: {len(stub_devices)})"
         
+        self._last_check_ts = now
+        self._last_device_count = device_count
         return False, "No update needed"
     
-    def update_stub_if_needed(self) -> bool:
-        """Update stub file if needed"""
+    def update_stub_if_needed(self) -> Tuple[bool, str]:
+        """
+        Update stub file if needed.
+        Returns (success, action) with action 'updated', 'skipped' (plugin files changed but the
+        stub content would not) or 'up_to_date'.
+        """
         should_update, reason = self.should_update_stub()
+        if should_update and self.stub_file.exists() and self._load_cache().get('devices_sig') == self._get_devices_sig():
+            # Plugin files changed but no device/class/module or generator did, so the stub content is the same
+            logger.debug(f"Stub content unchanged ({reason}); refreshing cache only")
+            devices = registry.list_devices()
+            self._save_cache(devices)
+            self._last_check_ts = time.monotonic()
+            self._last_device_count = len(devices)
+            return True, 'skipped'
         if should_update:
             logger.info(f"Updating stub file: {reason}")
             success = self.generate_stub()
-            self._save_cache()
-            return success
+            devices = registry.list_devices()
+            self._save_cache(devices)
+            if success:
+                self._last_check_ts = time.monotonic()
+                self._last_device_count = len(devices)
+            return success, 'updated'
         else:
             logger.debug(f"Stub file up to date: {reason}")
-            return True
+            return True, 'up_to_date'
     
     def generate_stub(self) -> bool:
         """Generate type stub file"""
         generation_start = datetime.now()
+        start_counter = time.perf_counter()
         
         try:
-            # Backup existing stub if it exists
-            if self.stub_file.exists():
-                self._backup_stub()
-            
             devices = registry.list_devices()
+            if not devices and self.stub_file.exists():
+                # Nothing was discovered (e.g. plugins directory missing); keep the existing stub
+                logger.warning("No devices registered; keeping existing stub file")
+                return True
             stub_content = self._generate_stub_content(devices)
             
-            # Write stub file
-            self.stub_file.write_text(stub_content, encoding='utf-8')
+            try:
+                old_content = self.stub_file.read_text(encoding='utf-8')
+            except FileNotFoundError:
+                old_content = None
+            
+            # Leave the file (and its mtime) alone when the content would not change
+            if old_content != stub_content:
+                # Backup existing stub if it exists
+                if old_content is not None:
+                    self._backup_stub(old_content)
+                
+                # Write stub file
+                with open(self.stub_file, 'w', encoding='utf-8', buffering=65536) as f:
+                    f.write(stub_content)
             
             # Update generation stats
             self.generation_stats = {
                 'generated_at': generation_start.isoformat(),
-                'duration': (datetime.now() - generation_start).total_seconds(),
+                'duration': time.perf_counter() - start_counter,
                 'devices_count': len(devices),
                 'devices': devices,
                 'stub_file_size': self.stub_file.stat().st_size,
@@ -86,23 +201,26 @@ class StubManager:
         except Exception as e:
             self.generation_stats = {
                 'generated_at': generation_start.isoformat(),
-                'duration': (datetime.now() - generation_start).total_seconds(),
+                'duration': time.perf_counter() - start_counter,
                 'error': str(e),
                 'success': False
             }
             logger.error(f"Failed to generate stub file: {e}")
             return False
     
-    def _backup_stub(self):
-        """Create backup of existing stub file"""
-        if not self.stub_file.exists():
+    def _backup_stub(self, content: Optional[str] = None):
+        """Create backup of existing stub file (content may be passed if already read)"""
+        if content is None and not self.stub_file.exists():
             return
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         backup_path = self.backup_dir / f"__init__.pyi.{timestamp}"
         
         try:
-            backup_path.write_text(self.stub_file.read_text(encoding='utf-8'), encoding='utf-8')
+            self.backup_dir.mkdir(exist_ok=True)
+            if content is None:
+                content = self.stub_file.read_text(encoding='utf-8')
+            backup_path.write_text(content, encoding='utf-8')
             logger.debug(f"Created stub backup: {backup_path}")
             
             # Keep only last 5 backups
@@ -130,141 +248,115 @@ class StubManager:
     
     def _generate_stub_content(self, devices: List[str]) -> str:
         """Generate stub file content"""
-        generation_time = datetime.now().isoformat()
-        imports = []
-        overloads = []
-        typed_connects = []
-        
-        # Basic imports
-        base_imports = [
-            f"# Auto-generated stub file - {generation_time}",
-            "# Do not edit manually - this file is automatically updated",
-            "",
-            "from typing import overload, Union, Literal",
-            "from .core.scpi.common_scpi import CommonSCPI, SCPIError",
-            "from .core.interfaces import ConnectionInterface"
-        ]
-        
-        # Plugin-specific imports and overloads
-        for device in devices:
-            device_info = registry.get_device_info(device)
-            if device_info:
-                class_name = device_info.device_class.__name__
-                module_name = device_info.device_class.__module__
-                
-                # Convert absolute module path to relative
-                if module_name.startswith('lab_instruments.'):
-                    relative_module = '.' + module_name[len('lab_instruments.'):]
-                else:
-                    relative_module = module_name
-                
-                imports.append(f"from {relative_module} import {class_name}")
-                overloads.append(f'def connect(dev: Literal["{device}"], method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> {class_name}: ...')
-                typed_connects.append(f'def connect_{device}(method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> {class_name}: ...')
-        
-        all_imports = base_imports + imports
-        imports_str = "\n".join(all_imports)
-        overloads_str = "\n".join([f"@overload\n{overload}" for overload in overloads])
-        typed_connects_str = "\n".join(typed_connects)
+        out = io.StringIO()
+        self._write_stub(out, devices)
+        return out.getvalue()
+    
+    def _write_stub(self, out, devices: List[str]) -> None:
+        """Write stub file content to a text stream, section by section"""
+        # Plugin-specific imports and overloads, from one registry snapshot
+        wanted = set(devices)
+        entries = [entry for entry in registry.snapshot() if entry[0] in wanted]
         
-        return f'''{imports_str}
-
-__version__: str
-
-# Device-specific overloads
-{overloads_str}
-
-# Generic device (string)
-@overload
-def connect(dev: str, method: str = None, plugins_dir: str = "lab_instruments/plugins", **kwargs) -> CommonSCPI: ...
-
-# Direct connection (no device specified)
-@overload  
-def connect(dev: None = None, method: str = ..., plugins_dir: str = "lab_instruments/plugins", **kwargs) -> ConnectionInterface: ...
-
-def connect(dev = None, method = None, plugins_dir: str = "lab_instruments/plugins", **kwargs): ...
-
-def list_devices() -> list[str]: ...
-
-# Typed connect functions (auto-generated)
-{typed_connects_str}
-
-# Other exports
-registry: object
-CommonSCPI: type[CommonSCPI]
-SCPIError: type[SCPIError]
-'''
+        out.write(_STUB_HEADER)
+        for device, class_name, module in entries:
+            out.write(_IMPORT_TPL % (module, class_name))
+        out.write(_STUB_OVERLOADS_HEADER)
+        for device, class_name, module in entries:
+            out.write(_OVERLOAD_TPL % (device, class_name))
+        out.write(_STUB_COMMON if entries else "\n" + _STUB_COMMON)
+        for device, class_name, module in entries:
+            out.write(_TYPED_CONNECT_TPL % (device, class_name))
+        out.write(_STUB_FOOTER if entries else "\n" + _STUB_FOOTER)
+    
+    def _get_devices_sig(self) -> dict:
+        """Get the generator signature and [device, class name, module] for each registered device, as stored in the cache"""
+        return {
+            'generator': _STUB_GENERATOR_SIG,
+            'devices': [list(entry) for entry in registry.snapshot()],
+        }
     
     def _get_stub_devices(self) -> Set[str]:
-        """Extract device names from existing stub file"""
+        """Get device names in the existing stub file (recorded in the cache when it was generated)"""
         if not self.stub_file.exists():
             return set()
         
+        cached_devices = self._load_cache().get('devices')
+        if cached_devices is not None:
+            return set(cached_devices)
+        
         try:
             content = self.stub_file.read_text(encoding='utf-8')
-            devices = set()
-            
             # Parse Literal types from overloads
-            import re
-            pattern = r'def connect\(dev: Literal\["([^"]+)"\]'
-            matches = re.findall(pattern, content)
-            devices.update(matches)
-            
-            return devices
+            return set(_DEVICE_RE.findall(content))
             
         except Exception as e:
             logger.warning(f"Failed to parse existing stub file: {e}")
             return set()
     
     def _get_plugins_hash(self) -> str:
-        """Generate hash from plugins directory content"""
-        if not self.plugins_dir.exists():
+        """
+        Generate a "<newest mtime_ns>:<file count>" fingerprint of the plugin directories and files.
+        Each plugin subdirectory's mtime is included, so files added, removed or replaced by an
+        atomic save are caught as well as <dev>_scpi.py and config.json edited in place.
+        """
+        try:
+            with os.scandir(self.plugins_dir) as it:
+                entries = list(it)
+        except OSError:
             return ""
         
-        plugin_info = {}
-        for device_dir in self.plugins_dir.iterdir():
-            if device_dir.is_dir() and not device_dir.name.startswith('.'):
-                # Check existence of SCPI file and config file
-                scpi_file = device_dir / f"{device_dir.name}_scpi.py"
-                config_file = device_dir / "config.json"
-                
-                if scpi_file.exists():
-                    plugin_info[device_dir.name] = {
-                        'scpi_mtime': scpi_file.stat().st_mtime,
-                        'scpi_size': scpi_file.stat().st_size,
-                        'config_exists': config_file.exists(),
-                        'config_mtime': config_file.stat().st_mtime if config_file.exists() else 0,
-                        'config_size': config_file.stat().st_size if config_file.exists() else 0
-                    }
-        
-        # Convert dictionary to JSON and hash
-        json_str = json.dumps(plugin_info, sort_keys=True)
-        return hashlib.md5(json_str.encode()).hexdigest()
+        # Change detection only needs the newest plugin mtime and the number of plugin files
+        latest = 0
+        count = 0
+        for entry in entries:
+            if entry.name[0] == '.' or not entry.is_dir():
+                continue
+            # Check existence of SCPI file and config file
+            try:
+                latest = max(latest, entry.stat().st_mtime_ns,
+                             os.stat(os.path.join(entry.path, f"{entry.name}_scpi.py")).st_mtime_ns)
+            except OSError:
+                continue
+            count += 1
+            try:
+                latest = max(latest, os.stat(os.path.join(entry.path, "config.json")).st_mtime_ns)
+                count += 1
+            except OSError:
+                pass
+        return f"{latest}:{count}"
+    
+    def _load_cache(self) -> dict:
+        """Get the cache file contents ({} if missing or invalid), reading the file only once"""
+        if self._cache is None:
+            try:
+                with open(self.cache_file, 'rb') as f:
+                    self._cache = _json_loads(f.read())
+            except (ValueError, OSError):
+                self._cache = {}
+            registry.load_method_cache(self._cache.get('method_sigs', {}))
+        return self._cache
     
     def _get_cached_hash(self) -> str:
         """Get cached hash"""
-        if not self.cache_file.exists():
-            return ""
-        
-        try:
-            with open(self.cache_file) as f:
-                cache_data = json.load(f)
-                return cache_data.get('plugins_hash', '')
-        except (json.JSONDecodeError, FileNotFoundError):
-            return ""
+        return self._load_cache().get('plugins_hash', '')
     
-    def _save_cache(self):
-        """Save current state to cache"""
+    def _save_cache(self, devices: Optional[List[str]] = None):
+        """Save current state to cache (devices: registry.list_devices() if already fetched)"""
         cache_data = {
             'last_updated': datetime.now().isoformat(),
-            'plugins_hash': self._get_plugins_hash(),
-            'devices': registry.list_devices(),
+            'plugins_hash': self._current_hash or self._get_plugins_hash(),
+            'devices': registry.list_devices() if devices is None else devices,
+            'devices_sig': self._get_devices_sig(),
+            'method_sigs': registry.get_method_cache(),
             'generation_stats': self.generation_stats
         }
         
+        self._cache = cache_data
+        self._current_hash = None
         try:
             with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+                json.dump(cache_data, f, separators=(',', ':'))
             logger.debug("Updated stub cache")
         except Exception as e:
             logger.warning(f"Failed to save stub cache: {e}")
@@ -300,11 +392,19 @@ SCPIError: type[SCPIError]
             # Remove cache if stub doesn't exist
             if not self.stub_file.exists() and self.cache_file.exists():
                 self.cache_file.unlink()
+                self._cache = None
                 logger.debug("Removed orphaned cache file")
                 
         except Exception as e:
             logger.warning(f"Cleanup failed: {e}")
 
-# Global instance
-_package_dir = Path(__file__).parent
-stub_manager = StubManager(_package_dir)
+@functools.cache
+def get_stub_manager() -> StubManager:
+    """Get the package StubManager, created on first use"""
+    return StubManager(Path(__file__).parent)
+
+def __getattr__(name: str):
+    """Keep `from .stub_manager import stub_manager` working without creating it at import"""
+    if name == 'stub_manager':
+        return get_stub_manager()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -1,6 +1,6 @@
-import os
 import sys
 import json
+from pathlib import Path
 
 PLUGIN_TEMPLATE = '''from ...core.scpi.common_scpi import CommonSCPI
 
@@ -30,6 +30,9 @@ CONFIG_TEMPLATE = {
     }
 }
 
+# Serialized once; the template is constant
+CONFIG_TEMPLATE_JSON = json.dumps(CONFIG_TEMPLATE, indent=2)
+
 def main():
 
     if len(sys.argv) == 2:
@@ -40,23 +43,17 @@ def main():
             print("Plugin name is required.")
             sys.exit(1)
     class_name = f"{name.upper()}SCPI"
-    plugin_dir = os.path.join("lab_instruments", "plugins", name)
-    os.makedirs(plugin_dir, exist_ok=True)
+    plugin_dir = Path("lab_instruments", "plugins", name)
+    plugin_dir.mkdir(parents=True, exist_ok=True)
 
     # Create __init__.py
-    init_path = os.path.join(plugin_dir, "__init__.py")
-    with open(init_path, "w") as f:
-        pass
+    (plugin_dir / "__init__.py").touch()
 
     # Create SCPI wrapper
-    scpi_path = os.path.join(plugin_dir, f"{name}_scpi.py")
-    with open(scpi_path, "w") as f:
-        f.write(PLUGIN_TEMPLATE.format(class_name=class_name))
+    (plugin_dir / f"{name}_scpi.py").write_text(PLUGIN_TEMPLATE.format(class_name=class_name), encoding="utf-8")
 
     # Create config.json
-    config_path = os.path.join(plugin_dir, "config.json")
-    with open(config_path, "w") as f:
-        json.dump(CONFIG_TEMPLATE, f, indent=2)
+    (plugin_dir / "config.json").write_text(CONFIG_TEMPLATE_JSON, encoding="utf-8")
 
     print(f"Plugin skeleton created at {plugin_dir}")
 
@@ -11,10 +11,12 @@ import json
 from datetime import datetime
 from pathlib import Path
 
-# Add parent directory to path for running as script
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-import lab_instruments
+# Use the installed package (pip install -e .); fall back to this checkout when running as a script
+try:
+    import lab_instruments
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import lab_instruments
 
 
 def print_header(title):
@@ -42,15 +44,17 @@ def diagnose_system():
         print_subsection("Registry Status")
         registry_stats = diagnosis['registry_status']
         if registry_stats:
-            print(f"Discovery Status: {'✓' if registry_stats.get('successful', 0) > 0 else '✗'}")
+            successful = registry_stats.get('successful', 0)
+            errors = registry_stats.get('errors')
+            print(f"Discovery Status: {'✓' if successful > 0 else '✗'}")
             print(f"Plugins Directory: {registry_stats.get('plugins_dir', 'N/A')}")
             print(f"Attempted: {registry_stats.get('attempted', 0)}")
-            print(f"Successful: {registry_stats.get('successful', 0)}")
+            print(f"Successful: {successful}")
             print(f"Failed: {registry_stats.get('failed', 0)}")
             
-            if registry_stats.get('errors'):
+            if errors:
                 print("Errors:")
-                for error in registry_stats['errors']:
+                for error in errors:
                     print(f"  - {error}")
         
         # Device Status
@@ -58,15 +62,16 @@ def diagnose_system():
         devices = diagnosis['devices']
         if devices:
             for device_name, device_data in devices.items():
-                status = "✓" if device_data['valid'] else "✗"
+                valid = device_data['valid']
+                info = device_data['info']
+                status = "✓" if valid else "✗"
                 print(f"{status} {device_name}")
                 
-                if not device_data['valid']:
+                if not valid:
                     for error in device_data['errors']:
                         print(f"    Error: {error}")
                 
-                if device_data['info']:
-                    info = device_data['info']
+                if info:
                     print(f"    Class: {info.get('class_name', 'N/A')}")
                     print(f"    Module: {info.get('module', 'N/A')}")
                     print(f"    Config: {'✓' if info.get('has_config') else '✗'}")
@@ -210,7 +215,11 @@ def test_device_connection(device_name):
                 print(f"⚠️  Could not get device ID: {e}")
             
             # Show available methods
-            methods = [m for m in dir(device) if not m.startswith('_') and callable(getattr(device, m))]
+            # Scan the class hierarchy rather than getattr() on the instance, so no descriptor can touch the device
+            methods = sorted(dict.fromkeys(
+                name for cls in type(device).__mro__ for name, value in vars(cls).items()
+                if not name.startswith('_') and callable(value)
+            ))
             print(f"✓ Available methods: {len(methods)}")
             for method in methods[:10]:  # Show first 10
                 print(f"  - {method}")
@@ -251,8 +260,8 @@ def refresh_system():
         return False
 
 
-def export_diagnostics(output_file):
-    """Export diagnostics to JSON file"""
+def export_diagnostics(output_file, indent=None):
+    """Export diagnostics to JSON file (compact unless indent is given)"""
     print(f"Exporting diagnostics to {output_file}...")
     
     try:
@@ -267,7 +276,10 @@ def export_diagnostics(output_file):
         }
         
         with open(output_file, 'w') as f:
-            json.dump(diagnosis, f, indent=2, default=str)
+            if indent is None:
+                json.dump(diagnosis, f, separators=(',', ':'), default=str)
+            else:
+                json.dump(diagnosis, f, indent=indent, default=str)
         
         print(f"✓ Diagnostics exported to {output_file}")
         return True
@@ -289,6 +301,7 @@ Examples:
   python scripts/diagnostics.py --test im3590     # Test specific device
   python scripts/diagnostics.py --refresh         # Refresh plugins and stubs
   python scripts/diagnostics.py --export diag.json # Export diagnostics
+  python scripts/diagnostics.py --export diag.json --indent 2 # Human-readable export
         """
     )
     
@@ -302,6 +315,8 @@ Examples:
                        help='Refresh plugins and regenerate stubs')
     parser.add_argument('--export', metavar='FILE',
                        help='Export diagnostics to JSON file')
+    parser.add_argument('--indent', type=int, default=None, metavar='N',
+                       help='Indent exported JSON by N spaces (default: compact)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose output')
     
@@ -324,7 +339,7 @@ Examples:
         elif args.refresh:
             success = refresh_system()
         elif args.export:
-            success = export_diagnostics(args.export)
+            success = export_diagnostics(args.export, args.indent)
         else:
             # Default: full system diagnosis
             success = diagnose_system()
@@ -4,18 +4,110 @@ Lab Instruments System Monitor Dashboard
 リアルタイムシステム監視、接続統計、デバイス状態の可視化
 """
 
+import asyncio
+import contextlib
 import sys
 import os
 import time
+import heapq
+import io
+import itertools
 import threading
+from array import array
 from datetime import datetime, timedelta
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 import json
 
-# Add parent directory to path for running as script
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import termios
+    import tty
+except ImportError:  # Windows
+    termios = None
+
+# Prefer orjson for the statistics dump when installed
+try:
+    import orjson
+    
+    def _dump_json(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
+except ImportError:
+    def _dump_json(obj):
+        return json.dumps(obj, indent=2, default=str)
+
+# Use the installed package (pip install -e .); fall back to this checkout when running as a script
+try:
+    import lab_instruments
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import lab_instruments
+
+
+def _clock(ts):
+    """Local HH:MM:SS for an epoch timestamp, formatted without strftime"""
+    tm = time.localtime(ts)
+    return f"{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+
+
+class StatsRing:
+    """Fixed-size ring buffer of system stats samples, one preallocated column per field"""
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))  # epoch seconds
+        self.devices_count = array('q', bytes(8 * capacity))
+        self.registry_successful = array('q', bytes(8 * capacity))
+        self.registry_failed = array('q', bytes(8 * capacity))
+        self.stub_success = array('b', bytes(capacity))
+        # (stub_last_generated, error) strings
+        self.texts = [None] * capacity
+        self.head = 0  # next slot to write
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def append(self, timestamp, devices_count=0, registry_successful=0, registry_failed=0,
+               stub_last_generated=None, stub_success=False, error=None):
+        """Write one sample (timestamp in epoch seconds) over the oldest slot"""
+        head = self.head
+        self.timestamps[head] = timestamp
+        self.devices_count[head] = devices_count
+        self.registry_successful[head] = registry_successful
+        self.registry_failed[head] = registry_failed
+        self.stub_success[head] = stub_success
+        self.texts[head] = (stub_last_generated, error)
+        self.head = (head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+    
+    def latest(self):
+        """Newest sample as a dict, or None when empty"""
+        if not self.count:
+            return None
+        i = (self.head - 1) % self.capacity
+        stub_last_generated, error = self.texts[i]
+        timestamp = datetime.fromtimestamp(self.timestamps[i])
+        if error is not None:
+            return {'timestamp': timestamp, 'error': error}
+        return {
+            'timestamp': timestamp,
+            'devices_count': self.devices_count[i],
+            'registry_successful': self.registry_successful[i],
+            'registry_failed': self.registry_failed[i],
+            'stub_last_generated': stub_last_generated,
+            'stub_success': bool(self.stub_success[i])
+        }
 
-import lab_instruments
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Latest sample of every section, published as one object so readers never see a mix of ticks"""
+    timestamp: float  # epoch seconds
+    stats: dict
+    devices: dict
+    conn: dict
 
 
 class SystemMonitor:
@@ -25,16 +117,36 @@ class SystemMonitor:
         self.history_size = history_size
         self.connection_history = deque(maxlen=history_size)
         self.device_status_history = deque(maxlen=history_size)
-        self.system_stats_history = deque(maxlen=history_size)
+        self.system_stats_history = StatsRing(history_size)
         self.monitoring = False
         self.monitor_thread = None
         self.update_interval = 5.0  # seconds
+        # Everything is recollected at least this often even without change events
+        self.heartbeat_interval = 60.0  # seconds
+        # Called from the monitor thread after each new sample (e.g. to wake the dashboard)
+        self.on_update = None
+        # Set by lab_instruments change callbacks; a section is recollected only when its flag is set
+        self._wake = threading.Event()
+        self._conn_dirty = True
+        self._dev_dirty = True
+        self._subscribed = False
+        # (registry version, devices, validation results) shared by collection and display
+        self._snapshot = None
+        # Validates devices concurrently, created on first use
+        self._val_pool = None
+        # Latest Snapshot, replaced (never mutated) by the monitor thread; None until the first sample
+        self._latest = None
         
     def start_monitoring(self):
         """Start background monitoring"""
         if self.monitoring:
             return
         
+        if not self._subscribed:
+            lab_instruments.on_connection_event(self._on_connection_event)
+            lab_instruments.on_device_change(self._on_device_change)
+            self._subscribed = True
+        
         self.monitoring = True
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
@@ -43,64 +155,127 @@ class SystemMonitor:
     def stop_monitoring(self):
         """Stop background monitoring"""
         self.monitoring = False
+        self._wake.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1.0)
+        if self._val_pool is not None:
+            self._val_pool.shutdown(wait=False)
+            self._val_pool = None
         print("⏹️  Background monitoring stopped")
     
+    def _on_connection_event(self, event):
+        """lab_instruments connection callback"""
+        self._conn_dirty = True
+        self._wake.set()
+    
+    def _on_device_change(self):
+        """lab_instruments registry change callback"""
+        self._dev_dirty = True
+        self._wake.set()
+    
     def _monitor_loop(self):
-        """Background monitoring loop"""
+        """Background monitoring loop, collecting only sections changed since the last sample"""
+        last_full = time.monotonic()
         while self.monitoring:
             try:
-                timestamp = datetime.now()
-                
-                # Collect system statistics
-                stats = self._collect_system_stats(timestamp)
-                self.system_stats_history.append(stats)
+                if time.monotonic() - last_full >= self.heartbeat_interval:
+                    self._conn_dirty = self._dev_dirty = True
                 
-                # Collect device status
-                device_status = self._collect_device_status(timestamp)
-                self.device_status_history.append(device_status)
+                dev_dirty, conn_dirty = self._dev_dirty, self._conn_dirty
+                if dev_dirty or conn_dirty:
+                    # Taken up front so events arriving during collection trigger another pass;
+                    # put back if this pass fails, so its changes are collected and drawn next time
+                    self._dev_dirty = self._conn_dirty = False
+                    try:
+                        self._collect_and_publish(dev_dirty, conn_dirty)
+                    except Exception:
+                        self._dev_dirty |= dev_dirty
+                        self._conn_dirty |= conn_dirty
+                        raise
+                    if dev_dirty and conn_dirty:
+                        last_full = time.monotonic()
                 
-                # Update connection history from lab_instruments
-                conn_stats = lab_instruments.get_connection_stats()
-                self.connection_history.append({
-                    'timestamp': timestamp,
-                    'stats': conn_stats
-                })
-                
-                time.sleep(self.update_interval)
+                self._wake.wait(self.update_interval)
+                self._wake.clear()
                 
             except Exception as e:
                 print(f"⚠️  Monitoring error: {e}")
                 time.sleep(1.0)
     
+    def _collect_and_publish(self, dev_dirty, conn_dirty):
+        """Recollect the dirty sections, publish a new Snapshot and call on_update"""
+        timestamp = time.time()
+        prev = self._latest
+        device_status = prev.devices if prev else {}
+        conn_stats = prev.conn if prev else {}
+        
+        if dev_dirty:
+            # Collect system statistics
+            self._collect_system_stats(timestamp)
+            
+            # Collect device status
+            device_status = self._collect_device_status(timestamp)
+            self.device_status_history.append(device_status)
+        
+        if conn_dirty:
+            # Update connection history from lab_instruments
+            conn_stats = lab_instruments.get_connection_stats()
+            self.connection_history.append({
+                'timestamp': timestamp,
+                'stats': conn_stats
+            })
+        
+        # Single attribute store: readers see either the old or the new snapshot
+        self._latest = Snapshot(timestamp, self.system_stats_history.latest(), device_status, conn_stats)
+        
+        on_update = self.on_update
+        if on_update is not None:
+            on_update()
+    
     def _collect_system_stats(self, timestamp):
-        """Collect general system statistics"""
+        """Collect general system statistics into system_stats_history"""
         try:
             registry_stats = lab_instruments.registry.get_discovery_stats()
             stub_stats = lab_instruments.stub_manager.get_generation_stats()
             
-            return {
-                'timestamp': timestamp,
-                'devices_count': len(lab_instruments.list_devices()),
-                'registry_successful': registry_stats.get('successful', 0),
-                'registry_failed': registry_stats.get('failed', 0),
-                'stub_last_generated': stub_stats.get('generated_at'),
-                'stub_success': stub_stats.get('success', False)
-            }
+            self.system_stats_history.append(
+                timestamp,
+                devices_count=len(lab_instruments.list_devices()),
+                registry_successful=registry_stats.get('successful', 0),
+                registry_failed=registry_stats.get('failed', 0),
+                stub_last_generated=stub_stats.get('generated_at'),
+                stub_success=stub_stats.get('success', False)
+            )
         except Exception as e:
-            return {
-                'timestamp': timestamp,
-                'error': str(e)
-            }
+            self.system_stats_history.append(timestamp, error=str(e))
+    
+    def snapshot(self, refresh=False):
+        """
+        Get (devices, validation results), recomputed only when the registry version
+        changed or refresh=True (config files can change without a registry change).
+        """
+        version = lab_instruments.registry.version
+        cached = self._snapshot
+        if refresh or cached is None or cached[0] != version:
+            devices = lab_instruments.list_devices()
+            cached = self._snapshot = (version, devices, self._validate_devices(devices))
+        return cached[1], cached[2]
+    
+    def _validate_devices(self, devices):
+        """Validate devices in parallel on a reused thread pool"""
+        if not devices:
+            return {}
+        if self._val_pool is None:
+            self._val_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="monitor-validate")
+        futures = {self._val_pool.submit(lab_instruments.registry.validate_device, device): device for device in devices}
+        return {futures[future]: future.result() for future in as_completed(futures)}
     
     def _collect_device_status(self, timestamp):
         """Collect device validation status"""
         device_status = {'timestamp': timestamp, 'devices': {}}
         
         try:
-            devices = lab_instruments.list_devices()
-            validation_results = lab_instruments.validate_all_devices()
+            devices, validation_results = self.snapshot(refresh=True)
             
             for device in devices:
                 is_valid, errors = validation_results.get(device, (False, ['Unknown error']))
@@ -115,21 +290,25 @@ class SystemMonitor:
         
         return device_status
     
+    @property
+    def latest(self):
+        """Most recent Snapshot, or None before the first sample"""
+        return self._latest
+    
     def get_summary(self):
         """Get current system summary"""
-        if not self.system_stats_history:
+        snap = self.latest
+        if snap is None:
             return None
         
-        latest_stats = self.system_stats_history[-1]
-        latest_conn = self.connection_history[-1] if self.connection_history else None
-        latest_devices = self.device_status_history[-1] if self.device_status_history else None
+        latest_stats = snap.stats
+        latest_devices = snap.devices
         
         summary = {
             'timestamp': latest_stats['timestamp'],
             'devices_registered': latest_stats.get('devices_count', 0),
-            'connection_stats': latest_conn['stats'] if latest_conn else {},
-            'device_validation': {},
-            'issues': []
+            'connection_stats': snap.conn,
+            'device_validation': {}
         }
         
         # Device validation summary
@@ -141,118 +320,159 @@ class SystemMonitor:
                 'valid': valid_devices,
                 'invalid': total_devices - valid_devices
             }
-            
-            # Collect issues
-            for device, status in latest_devices['devices'].items():
-                if not status['valid']:
-                    summary['issues'].extend([f"{device}: {error}" for error in status['errors']])
         
         return summary
+    
+    def iter_issues(self):
+        """Yield '<device>: <error>' for every validation error in the latest snapshot"""
+        snap = self.latest
+        if snap is None:
+            return
+        for device, status in snap.devices.get('devices', {}).items():
+            if not status['valid']:
+                for error in status['errors']:
+                    yield f"{device}: {error}"
+    
+    def issue_count(self):
+        """Number of issues iter_issues() would yield"""
+        snap = self.latest
+        if snap is None:
+            return 0
+        return sum(status['error_count'] for status in snap.devices.get('devices', {}).values() if not status['valid'])
+
+
+def _enable_windows_vt():
+    """Turn on ANSI escape processing for the Windows console; False if unavailable"""
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+    except Exception:
+        return False
 
 
 class DashboardDisplay:
     """Dashboard display and formatting"""
     
+    # Static frame parts, built once
+    _TOP = "╔" + "═" * 78 + "╗"
+    _TITLE = "║" + " LAB INSTRUMENTS SYSTEM DASHBOARD".center(78) + "║"
+    _BOTTOM = "╚" + "═" * 78 + "╝"
+    _SEP = "─" * 50
+    
     def __init__(self, monitor):
         self.monitor = monitor
-        self.last_update = None
+        self.last_update = None  # epoch seconds of the last frame
+        # device -> ((valid, shown errors, error count), rendered lines), reused while unchanged
+        self._device_lines = {}
+        # Header date, reformatted only when the day changes
+        self._date_day = None
+        self._date_str = ""
+        # Cursor home + erase display; nothing when not writing to a terminal
+        self._clear_seq = "\x1b[H\x1b[2J" if sys.stdout.isatty() else ""
+        if self._clear_seq and os.name == 'nt' and not _enable_windows_vt():
+            self._clear_seq = None  # old console without VT support: fall back to cls
     
     def clear_screen(self):
         """Clear terminal screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if self._clear_seq is None:
+            os.system('cls')
+        else:
+            sys.stdout.write(self._clear_seq)
+            sys.stdout.flush()
     
-    def print_header(self):
+    def print_header(self, out=None):
         """Print dashboard header"""
-        now = datetime.now()
-        print("╔" + "═" * 78 + "╗")
-        print("║" + " LAB INSTRUMENTS SYSTEM DASHBOARD".center(78) + "║")
-        print("║" + f" {now.strftime('%Y-%m-%d %H:%M:%S')}".center(78) + "║")
-        print("╚" + "═" * 78 + "╝")
+        now = time.time()
+        tm = time.localtime(now)
+        if tm.tm_yday != self._date_day:
+            self._date_day = tm.tm_yday
+            self._date_str = f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+        print(self._TOP, file=out)
+        print(self._TITLE, file=out)
+        print("║" + f" {self._date_str} {_clock(now)}".center(78) + "║", file=out)
+        print(self._BOTTOM, file=out)
     
-    def print_system_overview(self, summary):
+    def print_system_overview(self, summary, out=None):
         """Print system overview section"""
-        print("\n📊 SYSTEM OVERVIEW")
-        print("─" * 50)
+        print("\n📊 SYSTEM OVERVIEW", file=out)
+        print(self._SEP, file=out)
         
         if not summary:
-            print("⚠️  No monitoring data available")
+            print("⚠️  No monitoring data available", file=out)
             return
         
         devices_count = summary.get('devices_registered', 0)
-        print(f"Registered Devices: {devices_count}")
+        print(f"Registered Devices: {devices_count}", file=out)
         
         # Connection statistics
         conn_stats = summary.get('connection_stats', {})
         if conn_stats:
-            total = conn_stats.get('total_connections', 0)
-            successful = conn_stats.get('successful_connections', 0)
-            active = conn_stats.get('active_connections', 0)
-            pool_size = conn_stats.get('pool_size', 0)
+            get = conn_stats.get
+            total, successful, active, pool_size = (
+                get('total_connections', 0), get('successful_connections', 0),
+                get('active_connections', 0), get('pool_size', 0)
+            )
             
             success_rate = (successful / total * 100) if total > 0 else 0
             
-            print(f"Total Connections: {total}")
-            print(f"Success Rate: {success_rate:.1f}%")
-            print(f"Active Connections: {active}")
-            print(f"Connection Pool: {pool_size}")
+            print(f"Total Connections: {total}\n"
+                  f"Success Rate: {success_rate:.1f}%\n"
+                  f"Active Connections: {active}\n"
+                  f"Connection Pool: {pool_size}", file=out)
         
         # Device validation
         validation = summary.get('device_validation', {})
         if validation:
-            total = validation.get('total', 0)
-            valid = validation.get('valid', 0)
-            invalid = validation.get('invalid', 0)
+            get = validation.get
+            total, valid, invalid = get('total', 0), get('valid', 0), get('invalid', 0)
             
-            print(f"Device Validation: {valid}/{total} valid")
+            print(f"Device Validation: {valid}/{total} valid", file=out)
             if invalid > 0:
-                print(f"⚠️  {invalid} devices have configuration issues")
+                print(f"⚠️  {invalid} devices have configuration issues", file=out)
     
-    def print_device_status(self):
+    def print_device_status(self, out=None):
         """Print device status section"""
-        print("\n🔧 DEVICE STATUS")
-        print("─" * 50)
+        print("\n🔧 DEVICE STATUS", file=out)
+        print(self._SEP, file=out)
         
-        devices = lab_instruments.list_devices()
+        devices, validation_results = self.monitor.snapshot()
         if not devices:
-            print("No devices registered")
+            print("No devices registered", file=out)
             return
         
-        validation_results = lab_instruments.validate_all_devices()
-        
+        line_cache = self._device_lines
         for device in devices:
             is_valid, errors = validation_results.get(device, (False, ['Unknown']))
-            status_icon = "✅" if is_valid else "❌"
-            print(f"{status_icon} {device}")
-            
-            if not is_valid:
-                for error in errors[:2]:  # Show first 2 errors
-                    print(f"    • {error}")
-                if len(errors) > 2:
-                    print(f"    • ... and {len(errors) - 2} more")
+            key = (is_valid, tuple(errors[:2]), len(errors))
+            cached = line_cache.get(device)
+            if cached is None or cached[0] != key:
+                lines = [f"{'✅' if is_valid else '❌'} {device}"]
+                if not is_valid:
+                    lines.extend(f"    • {error}" for error in errors[:2])  # Show first 2 errors
+                    if len(errors) > 2:
+                        lines.append(f"    • ... and {len(errors) - 2} more")
+                cached = line_cache[device] = (key, "\n".join(lines))
+            print(cached[1], file=out)
     
-    def print_connection_history(self, limit=10):
+    def print_connection_history(self, limit=10, out=None):
         """Print recent connection history"""
-        print(f"\n📈 RECENT CONNECTIONS (Last {limit})")
-        print("─" * 50)
+        print(f"\n📈 RECENT CONNECTIONS (Last {limit})", file=out)
+        print(self._SEP, file=out)
         
-        if not self.monitor.connection_history:
-            print("No connection history available")
+        snap = self.monitor.latest
+        if snap is None or not snap.conn:
+            print("No connection history available", file=out)
             return
         
-        # Get recent connections from all history
-        all_connections = []
-        for entry in self.monitor.connection_history:
-            conn_stats = entry['stats']
-            history = conn_stats.get('connection_history', [])
-            for conn in history:
-                all_connections.append(conn)
-        
-        # Sort by start time and take most recent
-        all_connections.sort(key=lambda x: x.get('start_time', ''), reverse=True)
-        recent = all_connections[:limit]
+        recent = heapq.nlargest(limit, snap.conn.get('connection_history', []), key=lambda c: c.get('start_time', ''))
         
         if not recent:
-            print("No connection attempts recorded")
+            print("No connection attempts recorded", file=out)
             return
         
         for conn in recent:
@@ -262,55 +482,169 @@ class DashboardDisplay:
             start_time = conn.get('start_time', '')
             
             status_icon = "✅" if success else "❌"
-            time_str = start_time.split('T')[1][:8] if 'T' in start_time else start_time
+            _, sep, clock = start_time.partition('T')
+            time_str = clock[:8] if sep else start_time
             
-            print(f"{status_icon} {time_str} {device} ({duration:.3f}s)")
+            ms = round(duration * 1000)
+            print(f"{status_icon} {time_str} {device} ({ms // 1000}.{ms % 1000:03d}s)", file=out)
             
             if not success and conn.get('error'):
                 error = conn['error'][:60] + "..." if len(conn['error']) > 60 else conn['error']
-                print(f"    Error: {error}")
+                print(f"    Error: {error}", file=out)
     
-    def print_issues(self, summary):
+    def print_issues(self, out=None):
         """Print current issues"""
-        issues = summary.get('issues', []) if summary else []
+        count = self.monitor.issue_count()
         
-        print(f"\n⚠️  CURRENT ISSUES ({len(issues)})")
-        print("─" * 50)
+        print(f"\n⚠️  CURRENT ISSUES ({count})", file=out)
+        print(self._SEP, file=out)
         
-        if not issues:
-            print("✅ No issues detected")
+        if not count:
+            print("✅ No issues detected", file=out)
             return
         
-        for issue in issues[:10]:  # Show first 10 issues
-            print(f"• {issue}")
+        for issue in itertools.islice(self.monitor.iter_issues(), 10):  # Show first 10 issues
+            print(f"• {issue}", file=out)
         
-        if len(issues) > 10:
-            print(f"• ... and {len(issues) - 10} more issues")
+        if count > 10:
+            print(f"• ... and {count - 10} more issues", file=out)
     
-    def print_controls(self):
+    def print_controls(self, out=None):
         """Print control instructions"""
-        print("\n🎮 CONTROLS")
-        print("─" * 50)
-        print("r - Refresh plugins and stubs")
-        print("d - Run full diagnostics")
-        print("c - Clear connection pool")  
-        print("s - Show detailed statistics")
-        print("q - Quit")
+        print("\n🎮 CONTROLS", file=out)
+        print(self._SEP, file=out)
+        print("r - Refresh plugins and stubs", file=out)
+        print("d - Run full diagnostics", file=out)
+        print("c - Clear connection pool", file=out)
+        print("s - Show detailed statistics", file=out)
+        print("q - Quit", file=out)
     
     def display_dashboard(self):
-        """Display complete dashboard"""
-        self.clear_screen()
-        self.print_header()
+        """Display complete dashboard, rendered off-screen and written in one go"""
+        out = io.StringIO()
+        if self._clear_seq is None:
+            self.clear_screen()
+        else:
+            out.write(self._clear_seq)
+        self.print_header(out)
         
         summary = self.monitor.get_summary()
         
-        self.print_system_overview(summary)
-        self.print_device_status()
-        self.print_connection_history()
-        self.print_issues(summary)
-        self.print_controls()
+        self.print_system_overview(summary, out)
+        self.print_device_status(out)
+        self.print_connection_history(out=out)
+        self.print_issues(out)
+        self.print_controls(out)
+        
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+        self.last_update = time.time()
+
+
+@contextlib.contextmanager
+def _cbreak(fd):
+    """Put a terminal in cbreak mode so single keypresses arrive without Enter; yields False if not a terminal"""
+    if termios is None or not os.isatty(fd):
+        yield False
+        return
+    old = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    try:
+        yield True
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old)
+
+
+async def _next_line(lines):
+    """Wait for the next key (cbreak) or line; None at end of input"""
+    line = await lines.get()
+    return line.strip().lower() if line else None
+
+
+def _cmd_refresh():
+    print("🔄 Refreshing plugins...")
+    result = lab_instruments.refresh_plugins()
+    print(f"✅ Refresh completed. Added: {len(result['added_devices'])}, Removed: {len(result['removed_devices'])}")
+
+
+def _cmd_diagnostics():
+    print("🔍 Running diagnostics...")
+    diagnosis = lab_instruments.diagnose_system()
+    issues = diagnosis.get('issues', [])
+    print(f"✅ Diagnostics completed. Issues found: {len(issues)}")
+    if issues:
+        for issue in issues[:5]:
+            print(f"  • {issue}")
+
+
+def _cmd_clear_pool():
+    lab_instruments.clear_connection_pool()
+    print("✅ Connection pool cleared")
+
+
+def _cmd_stats():
+    stats = lab_instruments.get_connection_stats()
+    print("\n📊 Detailed Statistics:")
+    print(_dump_json(stats))
+
+
+# Dashboard commands by key ('q' is handled by the loop)
+_COMMANDS = {
+    'r': _cmd_refresh,
+    'd': _cmd_diagnostics,
+    'c': _cmd_clear_pool,
+    's': _cmd_stats,
+}
+
+
+async def _dashboard_main(monitor, display):
+    """Redraw when the monitor publishes new data or a command is entered"""
+    loop = asyncio.get_running_loop()
+    lines = asyncio.Queue()
+    updated = asyncio.Event()
+    fd = sys.stdin.fileno()
+    
+    with _cbreak(fd) as single_key:
+        if single_key:
+            read = lambda: os.read(fd, 1).decode(errors='ignore')
+            prompt, resume = "Command: ", "Press any key to continue..."
+        else:
+            read = sys.stdin.readline
+            prompt, resume = "Command (or Enter to refresh): ", "Press Enter to continue..."
+        loop.add_reader(fd, lambda: lines.put_nowait(read()))
+        monitor.on_update = lambda: loop.call_soon_threadsafe(updated.set)
         
-        self.last_update = datetime.now()
+        try:
+            while True:
+                display.display_dashboard()
+                
+                print(f"\nLast update: {_clock(display.last_update) if display.last_update else 'Never'}")
+                print(prompt, end='', flush=True)
+                
+                updated.clear()
+                line_task = asyncio.ensure_future(_next_line(lines))
+                update_task = asyncio.ensure_future(updated.wait())
+                done, pending = await asyncio.wait({line_task, update_task}, return_when=asyncio.FIRST_COMPLETED)
+                for task in pending:
+                    task.cancel()
+                if line_task not in done:
+                    continue
+                
+                command = line_task.result()
+                if command is None or command == 'q':
+                    break
+                handler = _COMMANDS.get(command)
+                if handler is None:
+                    continue
+                if single_key:
+                    print()
+                handler()
+                print(resume, end='', flush=True)
+                if await _next_line(lines) is None:
+                    break
+        finally:
+            monitor.on_update = None
+            loop.remove_reader(fd)
 
 
 def run_interactive_dashboard():
@@ -325,42 +659,7 @@ def run_interactive_dashboard():
         print("Press any key to continue...")
         input()
         
-        while True:
-            display.display_dashboard()
-            
-            print(f"\nLast update: {display.last_update.strftime('%H:%M:%S') if display.last_update else 'Never'}")
-            print("Command (or Enter to refresh): ", end='', flush=True)
-            
-            # Non-blocking input with timeout
-            import select
-            if select.select([sys.stdin], [], [], 3.0)[0]:  # 3 second timeout
-                command = input().strip().lower()
-                
-                if command == 'q':
-                    break
-                elif command == 'r':
-                    print("🔄 Refreshing plugins...")
-                    result = lab_instruments.refresh_plugins()
-                    print(f"✅ Refresh completed. Added: {len(result['added_devices'])}, Removed: {len(result['removed_devices'])}")
-                    input("Press Enter to continue...")
-                elif command == 'd':
-                    print("🔍 Running diagnostics...")
-                    diagnosis = lab_instruments.diagnose_system()
-                    issues = diagnosis.get('issues', [])
-                    print(f"✅ Diagnostics completed. Issues found: {len(issues)}")
-                    if issues:
-                        for issue in issues[:5]:
-                            print(f"  • {issue}")
-                    input("Press Enter to continue...")
-                elif command == 'c':
-                    lab_instruments.clear_connection_pool()
-                    print("✅ Connection pool cleared")
-                    input("Press Enter to continue...")
-                elif command == 's':
-                    stats = lab_instruments.get_connection_stats()
-                    print("\n📊 Detailed Statistics:")
-                    print(json.dumps(stats, indent=2, default=str))
-                    input("Press Enter to continue...")
+        asyncio.run(_dashboard_main(monitor, display))
     
     except KeyboardInterrupt:
         pass
@@ -386,7 +685,7 @@ def run_simple_monitor(duration=60, interval=5):
             if summary:
                 timestamp = summary['timestamp'].strftime('%H:%M:%S')
                 devices = summary.get('devices_registered', 0)
-                issues = len(summary.get('issues', []))
+                issues = monitor.issue_count()
                 
                 conn_stats = summary.get('connection_stats', {})
                 total_conn = conn_stats.get('total_connections', 0)
@@ -410,8 +709,7 @@ def run_simple_monitor(duration=60, interval=5):
             print(f"Total connections: {conn_stats.get('total_connections', 0)}")
             print(f"Success rate: {(conn_stats.get('successful_connections', 0) / max(conn_stats.get('total_connections', 1), 1) * 100):.1f}%")
             
-            issues = summary.get('issues', [])
-            print(f"Issues: {len(issues)}")
+            print(f"Issues: {monitor.issue_count()}")
 
 
 def main():
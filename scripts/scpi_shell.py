@@ -1,7 +1,74 @@
 import argparse
+import itertools
+import re
 import lab_instruments
 from lab_instruments.core.scpi.common_scpi import CommonSCPI
 
+HISTORY_FILE = ".scpi_history"
+
+# One command of a line: text up to the next ';' or newline, where ';' inside "..." or '...' string arguments doesn't count
+_COMMAND_RE = re.compile(r"""(?:"[^"\n]*"|'[^'\n]*'|[^;\n"']|["'])+""")
+
+# Numeric suffix of a mnemonic, e.g. the 1 of ':PARameter1?'
+_SUFFIX_RE = re.compile(r"(?<=[A-Z])\d+(?=[:?]|$)")
+
+def _scpi_commands(scpi):
+    """SCPI commands listed in SCPI_COMMANDS by the wrapper class and its bases"""
+    return sorted({
+        command for cls in type(scpi).__mro__ for command in vars(cls).get("SCPI_COMMANDS", ())
+    })
+
+def _build_trie(commands):
+    """Character trie of the upper-cased long and short forms of each command, without the leading ':'"""
+    root = {}
+    for command in commands:
+        # Short form keeps only the upper-case part of each mnemonic, e.g. ':FREQuency?' -> ':FREQ?'
+        short = "".join(ch for ch in command if not ch.islower())
+        for form in {command.upper(), short}:
+            node = root
+            for ch in form.lstrip(":"):
+                node = node.setdefault(ch, {})
+            node[None] = command
+    return root
+
+def _unknown_prefix(trie, command):
+    """None if the command's header is in the trie, else the longest known prefix of it"""
+    header = _SUFFIX_RE.sub("", command.split(None, 1)[0].upper().lstrip(":"))
+    node = trie
+    for i, ch in enumerate(header):
+        node = node.get(ch)
+        if node is None:
+            return header[:i]
+    return None if None in node else header
+
+def _make_prompt(scpi):
+    """prompt(message) with persistent history and command completion when prompt_toolkit is installed, else input()"""
+    try:
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.completion import WordCompleter
+        from prompt_toolkit.history import FileHistory
+    except ImportError:
+        return input
+    session = PromptSession(
+        history=FileHistory(HISTORY_FILE),
+        completer=WordCompleter(_scpi_commands(scpi), ignore_case=True, match_middle=True, sentence=True),
+    )
+    return session.prompt
+
+def _run_batch(scpi, commands):
+    """
+    Run several commands with one message per run of consecutive sends or queries:
+    sends as one compound write checked once with *OPC?/*ESR?, queries as one compound query.
+    """
+    for is_query, group in itertools.groupby(commands, key=lambda c: c.endswith("?")):
+        group = list(group)
+        if is_query:
+            for res in scpi.query_many(group):
+                print(res)
+        else:
+            scpi.send_many(group, safe=True)
+            print("OK")
+
 def main():
     parser = argparse.ArgumentParser(description="SCPI Shell CLI")
     parser.add_argument("--dev", type=str, help="Device name (uses plugins/{dev}/config.json)")
@@ -12,6 +79,7 @@ def main():
     parser.add_argument("--host", type=str, help="Socket host")
     parser.add_argument("--timeout", type=float, help="Timeout in seconds")
     parser.add_argument("--terminator", type=str, help="Terminator (CR, LF, CRLF, etc.)")
+    parser.add_argument("--strict", action="store_true", help="Reject commands not declared by the device wrapper")
     args = parser.parse_args()
 
     kwargs = {}
@@ -34,19 +102,30 @@ def main():
     if not isinstance(scpi, CommonSCPI):
         scpi = CommonSCPI(scpi)
 
+    prompt = _make_prompt(scpi)
+    trie = _build_trie(_scpi_commands(scpi)) if args.strict else None
     print("Welcome to the SCPI shell. Type 'exit' or 'quit' to leave.")
     while True:
         try:
-            cmd = input("SCPI> ").strip()
+            cmd = prompt("SCPI> ").strip()
             if cmd.lower() in ("exit", "quit"):
                 break
             if not cmd:
                 continue
-            if cmd.endswith("?"):
-                res = scpi.s_query(cmd)
+            commands = [c.strip() for c in _COMMAND_RE.findall(cmd) if c.strip()]
+            if trie is not None:
+                unknown = [(c, prefix) for c in commands if (prefix := _unknown_prefix(trie, c)) is not None]
+                if unknown:
+                    for c, prefix in unknown:
+                        print(f"Unknown command: {c} (known up to '{prefix}')")
+                    continue
+            if len(commands) > 1:
+                _run_batch(scpi, commands)
+            elif commands[0].endswith("?"):
+                res = scpi.s_query(commands[0])
                 print(res)
             else:
-                scpi.s_send(cmd)
+                scpi.s_send(commands[0])
                 print("OK")
         except Exception as e:
             print(f"Error: {e}")
@@ -1,7 +1,14 @@
+import functools
+
 import pyvisa
 
+@functools.lru_cache(maxsize=1)
+def _get_rm():
+    """Create the VISA ResourceManager once; loading the VISA library is slow"""
+    return pyvisa.ResourceManager()
+
 def main():
-    rm = pyvisa.ResourceManager()
+    rm = _get_rm()
     resources = rm.list_resources()
     if resources:
         print("Available VISA addresses:")
@@ -6,49 +6,168 @@ Lab Instruments Enhanced Features Integration Test
 
 import sys
 import os
-import json
+import io
+import argparse
+import contextlib
+import functools
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from datetime import datetime
 
-# Add parent directory to path for running as script
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Use the installed package (pip install -e .); fall back to this checkout when running as a script
+try:
+    import lab_instruments
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import lab_instruments
 
-import lab_instruments
+# Prefer orjson for writing the report when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
+def _jsonify(obj):
+    """Convert obj to plain JSON types so the encoder needs no default= callback"""
+    if obj is None or isinstance(obj, (str, int, float)):
+        return obj
+    if isinstance(obj, dict):
+        return {key: _jsonify(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [_jsonify(value) for value in obj]
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, os.PathLike):
+        return os.fspath(obj)
+    if hasattr(obj, '__dict__') and not isinstance(obj, type) and not callable(obj):
+        return _jsonify(vars(obj))
+    return str(obj)
+
+
+def _write_report(path, report):
+    """Write the report as indented JSON (orjson when available)"""
+    report = _jsonify(report)
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        import json  # only needed when a report is written without orjson
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+# Section rules for the console output
+_SEP = "-" * 40
+_BAR = "=" * 60
+
+# Device sets before/after refresh_plugins() and their differences, computed once
+RefreshResult = namedtuple('RefreshResult', 'old_devices new_devices added_devices removed_devices stub_regenerated')
+
+
+# Per-thread output buffer used while tests run concurrently (see _ThreadStdout)
+_local = threading.local()
+
+
+class _ThreadStdout:
+    """stdout proxy that sends each thread's writes to its own buffer, if it has one"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        buf = getattr(_local, 'buf', None)
+        return (self._stream if buf is None else buf).write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _run_captured(func):
+    """Run func with this thread's output collected; return the output"""
+    _local.buf = io.StringIO()
+    try:
+        func()
+        return _local.buf.getvalue()
+    finally:
+        del _local.buf
+
+
+def _buffered(func):
+    """Collect a test's output and write it to stdout in one go"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_local, 'buf', None) is not None:
+            # Already being captured by _run_captured()
+            return func(*args, **kwargs)
+        buf = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buf):
+                return func(*args, **kwargs)
+        finally:
+            sys.stdout.write(buf.getvalue())
+            sys.stdout.flush()
+    return wrapper
+
+
+@functools.lru_cache(maxsize=1)
+def _devices():
+    """Registered devices, listed once per run (cleared after refresh_plugins)"""
+    return tuple(lab_instruments.list_devices())
+
+
+@functools.lru_cache(maxsize=None)
+def _info(device):
+    """get_device_info() per device, computed once per run (cleared after refresh_plugins)"""
+    return lab_instruments.get_device_info(device)
+
+
+@functools.lru_cache(maxsize=1)
+def _validation():
+    """validate_all_devices() result, computed once per run (cleared after refresh_plugins)"""
+    return lab_instruments.validate_all_devices()
+
+
+@_buffered
 def test_registry_features():
     """Test enhanced registry features"""
     print("🧪 Testing Registry Features")
-    print("-" * 40)
+    print(_SEP)
     
     # Get discovery stats
     stats = lab_instruments.registry.get_discovery_stats()
     print(f"✓ Discovery stats: {stats.get('successful', 0)} successful, {stats.get('failed', 0)} failed")
     
+    # Validate all devices once; the per-device checks below read from it
+    all_validation = _validation()
+    
     # Get device metadata
-    devices = lab_instruments.list_devices()
+    devices = _devices()
     for device in devices[:2]:  # Test first 2 devices
-        metadata = lab_instruments.get_device_info(device)
+        metadata = _info(device)
         if metadata:
             print(f"✓ {device} metadata: {metadata['class_name']} ({len(metadata.get('methods', []))} methods)")
         
         # Test validation
-        is_valid, errors = lab_instruments.validate_device(device)
+        is_valid, errors = all_validation[device]
         print(f"✓ {device} validation: {'Valid' if is_valid else 'Invalid'}")
         if errors:
             print(f"  Errors: {', '.join(errors[:2])}")
     
     # Test all devices validation
-    all_validation = lab_instruments.validate_all_devices()
-    valid_count = sum(1 for is_valid, _ in all_validation.values() if is_valid)
+    valid_count = sum(map(itemgetter(0), all_validation.values()))
     print(f"✓ All devices validation: {valid_count}/{len(all_validation)} valid")
     
     print("✅ Registry features test completed\n")
 
 
-def test_stub_manager_features():
+@_buffered
+def test_stub_manager_features(force=False):
     """Test enhanced stub manager features"""
     print("🧪 Testing Stub Manager Features")
-    print("-" * 40)
+    print(_SEP)
     
     # Check stub status
     should_update, reason = lab_instruments.stub_manager.should_update_stub()
@@ -67,18 +186,23 @@ def test_stub_manager_features():
         print(f"✓ Cache last updated: {cache_info.get('last_updated', 'Never')}")
         print(f"  Cached devices: {len(cache_info.get('devices', []))}")
     
-    # Test force regeneration
-    print("Testing force regeneration...")
-    success = lab_instruments.stub_manager.force_regenerate()
-    print(f"✓ Force regeneration: {'Success' if success else 'Failed'}")
+    # Regenerate only when the stub is out of date (or --force); otherwise check the existing file
+    if force or should_update:
+        print("Testing force regeneration...")
+        success = lab_instruments.stub_manager.force_regenerate()
+        print(f"✓ Force regeneration: {'Success' if success else 'Failed'}")
+    else:
+        success = lab_instruments.stub_manager.stub_file.exists()
+        print(f"✓ Stub file up to date: {'Yes' if success else 'Missing'}")
     
     print("✅ Stub manager features test completed\n")
 
 
+@_buffered
 def test_factory_features():
     """Test enhanced factory features"""
     print("🧪 Testing Factory Features")
-    print("-" * 40)
+    print(_SEP)
     
     # Get connection stats
     stats = lab_instruments.get_connection_stats()
@@ -86,10 +210,10 @@ def test_factory_features():
     print(f"  Active: {stats['active_connections']}, Pool: {stats['pool_size']}")
     
     # Test device info functions
-    devices = lab_instruments.list_devices()
+    devices = _devices()
     if devices:
         device = devices[0]
-        info = lab_instruments.get_device_info(device)
+        info = _info(device)
         print(f"✓ Device info for {device}: {info['class_name'] if info else 'None'}")
     
     # Test connection with validation disabled (should be faster)
@@ -111,12 +235,13 @@ def test_factory_features():
     print("✅ Factory features test completed\n")
 
 
+@_buffered
 def test_connection_pooling():
     """Test connection pooling functionality"""
     print("🧪 Testing Connection Pooling")
-    print("-" * 40)
+    print(_SEP)
     
-    devices = lab_instruments.list_devices()
+    devices = _devices()
     if not devices:
         print("⚠️  No devices available for pooling test")
         return
@@ -133,26 +258,29 @@ def test_connection_pooling():
         
         # Create pooled connection
         print(f"Creating pooled connection to {device}...")
-        with lab_instruments.connect(dev=device, use_pool=True) as dev1:
-            mid_stats = lab_instruments.get_connection_stats()
-            mid_pool_size = mid_stats['pool_size']
+        dev1 = lab_instruments.acquire(dev=device, use_pool=True)
+        try:
+            mid_pool_size = lab_instruments.get_pool_size()
             print(f"✓ Pool size after first connection: {mid_pool_size}")
             
             # Create second connection with same parameters (should reuse)
             print("Creating second pooled connection with same parameters...")
-            with lab_instruments.connect(dev=device, use_pool=True) as dev2:
-                final_stats = lab_instruments.get_connection_stats()
-                final_pool_size = final_stats['pool_size']
+            dev2 = lab_instruments.acquire(dev=device, use_pool=True)
+            try:
+                final_pool_size = lab_instruments.get_pool_size()
                 print(f"✓ Pool size after second connection: {final_pool_size}")
                 
                 # Check if same instance (pooled)
                 is_same = dev1 is dev2
                 print(f"✓ Connection pooling working: {'Yes' if is_same else 'No'}")
+            finally:
+                lab_instruments.release(dev2)
+        finally:
+            lab_instruments.release(dev1)
         
         # Clear pool
         lab_instruments.clear_connection_pool()
-        cleared_stats = lab_instruments.get_connection_stats()
-        cleared_pool_size = cleared_stats['pool_size']
+        cleared_pool_size = lab_instruments.get_pool_size()
         print(f"✓ Pool size after clearing: {cleared_pool_size}")
         
     except Exception as e:
@@ -161,78 +289,91 @@ def test_connection_pooling():
     print("✅ Connection pooling test completed\n")
 
 
+@_buffered
 def test_refresh_functionality():
     """Test plugin refresh functionality"""
     print("🧪 Testing Refresh Functionality")
-    print("-" * 40)
+    print(_SEP)
     
     # Get initial state
-    initial_devices = set(lab_instruments.list_devices())
+    initial_devices = set(_devices())
     print(f"Initial devices: {len(initial_devices)}")
     
     # Perform refresh
     print("Performing plugin refresh...")
     refresh_result = lab_instruments.refresh_plugins()
+    _devices.cache_clear()
+    _info.cache_clear()
+    _validation.cache_clear()
+    
+    old = frozenset(refresh_result['old_devices'])
+    new = frozenset(refresh_result['new_devices'])
+    result = RefreshResult(old, new, new - old, old - new, refresh_result['stub_regenerated'])
     
     print("✓ Refresh completed")
-    print(f"  Old devices: {len(refresh_result['old_devices'])}")
-    print(f"  New devices: {len(refresh_result['new_devices'])}")
-    print(f"  Added: {refresh_result['added_devices']}")
-    print(f"  Removed: {refresh_result['removed_devices']}")
-    print(f"  Stub regenerated: {refresh_result['stub_regenerated']}")
+    print(f"  Old devices: {len(result.old_devices)}")
+    print(f"  New devices: {len(result.new_devices)}")
+    print(f"  Added: {sorted(result.added_devices)}")
+    print(f"  Removed: {sorted(result.removed_devices)}")
+    print(f"  Stub regenerated: {result.stub_regenerated}")
     
     # Check final state
-    final_devices = set(lab_instruments.list_devices())
+    final_devices = set(_devices())
     print(f"Final devices: {len(final_devices)}")
     
     print("✅ Refresh functionality test completed\n")
+    return result
 
 
+@_buffered
 def test_error_handling():
     """Test error handling and edge cases"""
     print("🧪 Testing Error Handling")
-    print("-" * 40)
-    
-    # Test invalid device
-    try:
-        with lab_instruments.connect(dev="nonexistent_device") as dev:
-            pass
-        print("❌ Should have failed for nonexistent device")
-    except Exception as e:
-        print(f"✓ Correctly handled invalid device: {type(e).__name__}")
-    
-    # Test invalid method for raw connection
-    try:
-        with lab_instruments.connect(method="invalid_method") as conn:
-            pass
-        print("❌ Should have failed for invalid method")
-    except Exception as e:
-        print(f"✓ Correctly handled invalid method: {type(e).__name__}")
+    print(_SEP)
+    
+    # Invalid device and invalid raw connection method; connect() rejects both with ValueError
+    cases = (
+        ({'dev': "nonexistent_device"}, "device"),
+        ({'method': "invalid_method"}, "method"),
+    )
+    for kwargs, label in cases:
+        try:
+            with lab_instruments.connect(**kwargs):
+                pass
+            print(f"❌ Should have failed for invalid {label}")
+        except ValueError as e:
+            print(f"✓ Correctly handled invalid {label}: {type(e).__name__}")
     
     # Test device validation
-    validation_results = lab_instruments.validate_all_devices()
+    validation_results = _validation()
     invalid_devices = [name for name, (valid, _) in validation_results.items() if not valid]
     print(f"✓ Found {len(invalid_devices)} devices with invalid configurations")
     
     print("✅ Error handling test completed\n")
 
 
+@_buffered
 def test_monitoring_features():
     """Test monitoring and statistics features"""
     print("🧪 Testing Monitoring Features")
-    print("-" * 40)
+    print(_SEP)
     
     # Get comprehensive stats
     stats = lab_instruments.get_connection_stats()
     print("✓ Connection statistics collected:")
-    print(f"  Total: {stats['total_connections']}")
-    print(f"  Successful: {stats['successful_connections']}")
-    print(f"  Failed: {stats['failed_connections']}")
-    print(f"  History entries: {len(stats.get('connection_history', []))}")
+    if stats['total_connections'] == 0:
+        print("  (no connections recorded)")
+    else:
+        print(f"  Total: {stats['total_connections']}")
+        print(f"  Successful: {stats['successful_connections']}")
+        print(f"  Failed: {stats['failed_connections']}")
+        print(f"  History entries: {len(stats.get('connection_history', []))}")
     
     # Test registry stats
     registry_stats = lab_instruments.registry.get_discovery_stats()
-    if registry_stats:
+    if registry_stats and registry_stats.get('attempted', 0) == 0:
+        print("✓ Registry discovery stats: (no discovery attempted)")
+    elif registry_stats:
         print("✓ Registry discovery stats:")
         print(f"  Attempted: {registry_stats.get('attempted', 0)}")
         print(f"  Successful: {registry_stats.get('successful', 0)}")
@@ -240,7 +381,9 @@ def test_monitoring_features():
     
     # Test stub stats
     stub_stats = lab_instruments.stub_manager.get_generation_stats()
-    if stub_stats:
+    if stub_stats and stub_stats.get('duration', 0) == 0:
+        print("✓ Stub generation stats: (no generation recorded)")
+    elif stub_stats:
         print("✓ Stub generation stats:")
         print(f"  Success: {stub_stats.get('success', False)}")
         print(f"  Duration: {stub_stats.get('duration', 0):.3f}s")
@@ -249,36 +392,42 @@ def test_monitoring_features():
     print("✅ Monitoring features test completed\n")
 
 
-def export_test_report():
+@_buffered
+def export_test_report(refresh_result=None, started=None):
     """Export comprehensive test report"""
     print("📊 Generating Test Report")
-    print("-" * 40)
+    print(_SEP)
+    
+    # One timestamp (the run start, when given) for the report field and the file name
+    now = started or datetime.now()
     
     # Collect comprehensive system info
     report = {
-        'test_timestamp': datetime.now().isoformat(),
+        'test_timestamp': now.isoformat(),
         'system_diagnosis': lab_instruments.diagnose_system(),
         'connection_statistics': lab_instruments.get_connection_stats(),
-        'device_metadata': lab_instruments.get_all_devices_info(),
-        'validation_results': lab_instruments.validate_all_devices(),
+        'device_metadata': {device: _info(device) for device in _devices()},
+        'validation_results': _validation(),
         'registry_stats': lab_instruments.registry.get_discovery_stats(),
         'stub_stats': lab_instruments.stub_manager.get_generation_stats(),
         'cache_info': lab_instruments.stub_manager.get_cache_info()
     }
+    if refresh_result is not None:
+        report['refresh'] = {key: sorted(value) if isinstance(value, frozenset) else value
+                             for key, value in refresh_result._asdict().items()}
     
     # Export to file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
     report_file = f"lab_instruments_test_report_{timestamp}.json"
     
     try:
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        _write_report(report_file, report)
         print(f"✓ Test report exported to: {report_file}")
         
         # Show summary
         diagnosis = report['system_diagnosis']
         issues = len(diagnosis.get('issues', []))
-        devices = len(lab_instruments.list_devices())
+        devices = len(_devices())
         
         print("📋 Report Summary:")
         print(f"  Devices: {devices}")
@@ -294,29 +443,42 @@ def export_test_report():
 
 def main():
     """Main test runner"""
+    parser = argparse.ArgumentParser(description="Lab Instruments enhanced features integration test")
+    parser.add_argument('--force', action='store_true', help='Always regenerate the stub file')
+    args = parser.parse_args()
+    
     print("🚀 Lab Instruments Enhanced Features Integration Test")
-    print("=" * 60)
-    print(f"Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
+    print(_BAR)
+    started = datetime.now()
+    print(f"Test started at: {started.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(_BAR)
     
     try:
-        # Run all test suites
-        test_registry_features()
-        test_stub_manager_features()
+        # Read-only suites run concurrently; output is emitted afterwards in this order
+        read_only = (
+            test_registry_features,
+            test_monitoring_features,
+        )
+        with contextlib.redirect_stdout(_ThreadStdout(sys.stdout)):
+            with ThreadPoolExecutor(max_workers=len(read_only)) as executor:
+                outputs = list(executor.map(_run_captured, read_only))
+        sys.stdout.write(''.join(outputs))
+        
+        # Suites that write the stub/cache files, connect or refresh plugins run one at a time
+        test_stub_manager_features(force=args.force)
         test_factory_features()
         test_connection_pooling()
-        test_refresh_functionality()
+        refresh_result = test_refresh_functionality()
         test_error_handling()
-        test_monitoring_features()
         
         # Generate final report
-        report_file = export_test_report()
+        report_file = export_test_report(refresh_result, started)
         
-        print("=" * 60)
+        print(_BAR)
         print("✅ ALL TESTS COMPLETED SUCCESSFULLY")
         if report_file:
             print(f"📁 Detailed report: {report_file}")
-        print("=" * 60)
+        print(_BAR)
         
         return True
         
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Tests for connection framing with fake transports (no instrument needed)
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the current directory to Python path for testing
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lab_instruments.core import connection_factory
+from lab_instruments.core.connection_factory import (
+    clear_connection_pool,
+    create_connection,
+    get_pool_size,
+    register_connection_method,
+)
+from lab_instruments.core.interfaces.socket_interface import SocketConnection
+from lab_instruments.core.interfaces.connection import (
+    ConnectionClosedError,
+    ConnectionContextMixin,
+    ConnectionProtocolError,
+)
+
+class FakeSocket:
+    """Socket stand-in whose recv_into returns the given chunks one per call, then b'' (peer closed)"""
+
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+        self.recv_calls = 0
+        self.sent = []
+
+    def recv_into(self, view):
+        self.recv_calls += 1
+        if not self.chunks:
+            return 0
+        chunk = self.chunks.pop(0)
+        n = min(len(view), len(chunk))
+        view[:n] = chunk[:n]
+        if n < len(chunk):
+            self.chunks.insert(0, chunk[n:])
+        return n
+
+    def sendall(self, data):
+        self.sent.append(data)
+
+    def close(self):
+        pass
+
+class FakeConnection(ConnectionContextMixin):
+    """Connection over an in-memory byte stream, with lines split on '\\n'"""
+
+    def __init__(self, data):
+        self.data = bytearray(data)
+
+    def read(self):
+        line, _, rest = bytes(self.data).partition(b"\n")
+        self.data[:] = rest
+        return line.strip().decode()
+
+    def _read_exact(self, size):
+        if len(self.data) < size:
+            raise ConnectionClosedError("Stream ended")
+        out = bytes(self.data[:size])
+        del self.data[:size]
+        return out
+
+class CountingConnection(ConnectionContextMixin):
+    """Connection that only records how often it was opened and closed"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.connects = 0
+        self.disconnects = 0
+        self.open = False
+
+    def connect(self):
+        if not self.open:
+            self.connects += 1
+            self.open = True
+
+    def disconnect(self):
+        self.disconnects += 1
+        self.open = False
+
+    def write(self, command):
+        pass
+
+    def read(self):
+        return "1"
+
+    def query(self, command):
+        return "1"
+
+    def _read_exact(self, size):
+        return bytes(size)
+
+    def is_connected(self):
+        return self.open
+
+@pytest.fixture
+def counting_method():
+    """Register CountingConnection as the 'counting' method, with an empty pool before and after"""
+    clear_connection_pool()
+    register_connection_method("counting", CountingConnection)
+    yield "counting"
+    clear_connection_pool()
+    del connection_factory._CONN_CLASSES["counting"]
+
+def _socket_connection(*chunks, terminator="\r\n"):
+    conn = SocketConnection("localhost", 5025, terminator=terminator)
+    conn.sock = FakeSocket(*chunks)
+    return conn
+
+def test_socket_read_single_response():
+    """A whole response in one recv is returned without the terminator"""
+    conn = _socket_connection(b"HIOKI,IM3590,0,V1.00\r\n")
+    assert conn.read() == "HIOKI,IM3590,0,V1.00"
+
+def test_socket_read_pipelined_responses_in_one_recv():
+    """Responses arriving together are split on the terminator and the rest kept for the next read"""
+    conn = _socket_connection(b"1\r\n+1.000E+03\r\nFAST\r\n")
+    assert conn.read() == "1"
+    assert conn.read() == "+1.000E+03"
+    assert conn.read() == "FAST"
+    assert conn.sock.recv_calls == 1
+
+def test_socket_query_pipelined():
+    """query_pipelined sends all queries in one sendall and reads one response each"""
+    conn = _socket_connection(b"LCR\r\n1000", b"\r\n")
+    assert conn.query_pipelined([":MODE?", ":FREQuency?"]) == ["LCR", "1000"]
+    assert conn.sock.sent == [b":MODE?\r\n:FREQuency?\r\n"]
+
+def test_socket_read_terminator_split_across_recvs():
+    """A terminator split between two recvs is still found"""
+    conn = _socket_connection(b"12.5\r", b"\n3.0\r\n")
+    assert conn.read() == "12.5"
+    assert conn.read() == "3.0"
+
+def test_socket_read_response_split_across_recvs():
+    """A response spread over several recvs is joined"""
+    conn = _socket_connection(b"+1.2", b"34E", b"-03\r\n")
+    assert conn.read() == "+1.234E-03"
+
+def test_socket_read_peer_closed():
+    """A peer that closes before sending anything raises instead of returning an empty string"""
+    conn = _socket_connection()
+    with pytest.raises(ConnectionClosedError):
+        conn.read()
+
+def test_socket_read_binary_block_then_terminator():
+    """A #N<len> block split across recvs is returned as bytes and its terminator consumed"""
+    conn = _socket_connection(b"#15hel", b"lo\r\nOK\r\n")
+    data = conn.read_binary()
+    assert data == b"hello"
+    assert type(data) is bytes
+    assert conn.read() == "OK"
+
+def test_socket_read_binary_after_buffered_response():
+    """A block received together with the previous response is read from the buffered bytes"""
+    conn = _socket_connection(b"1\r\n#210\r\n\r\nabcdef\r\n")
+    assert conn.read() == "1"
+    assert conn.read_binary() == b"\r\n\r\nabcdef"
+    assert conn.sock.recv_calls == 1
+
+def test_read_binary_block_then_terminator():
+    """ConnectionContextMixin.read_binary reads header, length and data through _read_exact"""
+    conn = FakeConnection(b"#3004\x00\x01\x02\x03\nnext\n")
+    assert conn.read_binary() == b"\x00\x01\x02\x03"
+    assert conn.read() == "next"
+
+def test_read_binary_dtype():
+    """With dtype the block is returned as a numpy array over the bytes"""
+    numpy = pytest.importorskip("numpy")
+    conn = FakeConnection(numpy.array([1.5, -2.0], dtype="<f4").tobytes().join([b"#18", b"\n"]))
+    assert conn.read_binary(dtype="<f4").tolist() == [1.5, -2.0]
+
+@pytest.mark.parametrize("data", [b"15hello\n", b"#0\n", b"#x5hello\n"])
+def test_read_binary_invalid_header(data):
+    """Anything but '#' and a non-zero digit count is rejected"""
+    with pytest.raises(ConnectionProtocolError):
+        FakeConnection(data).read_binary()
+
+def test_pool_handles_share_one_connection(counting_method):
+    """Handles for the same endpoint share one connection and count themselves while open"""
+    params = {"host": "10.0.0.5", "port": 5025}
+    first = create_connection(counting_method, None, dict(params), use_pool=True)
+    second = create_connection(counting_method, None, dict(params), use_pool=True)
+    assert first.conn is second.conn
+    assert get_pool_size() == 1
+    with first, second:
+        assert first._entry[1] == 2
+        assert first.conn.connects == 1
+    assert first._entry[1] == 0
+    # Released handles leave the shared connection open for reuse
+    assert first.conn.is_connected()
+
+def test_pool_release_then_clear_closes_connection(counting_method):
+    """Acquire/release returns the count to zero, and clearing the pool then closes the connection"""
+    handle = create_connection(counting_method, None, {"host": "10.0.0.5", "port": 5025}, use_pool=True)
+    handle.connect()
+    handle.disconnect()
+    handle.disconnect()  # A second release of the same handle is ignored
+    assert handle._entry[1] == 0
+    clear_connection_pool()
+    assert get_pool_size() == 0
+    assert not handle.conn.is_connected()
+    assert handle.conn.disconnects == 1
+
+def test_pool_clear_while_in_use_closes_on_last_release(counting_method):
+    """A connection still in use when the pool is cleared closes when its last handle is released"""
+    params = {"host": "10.0.0.5", "port": 5025}
+    first = create_connection(counting_method, None, dict(params), use_pool=True)
+    second = create_connection(counting_method, None, dict(params), use_pool=True)
+    first.connect()
+    second.connect()
+    clear_connection_pool()
+    assert first.conn.is_connected()
+    first.disconnect()
+    assert first.conn.is_connected()
+    second.disconnect()
+    assert second._entry[1] == 0
+    assert not second.conn.is_connected()
+    # A new handle after clearing opens a fresh connection
+    third = create_connection(counting_method, None, dict(params), use_pool=True)
+    assert third.conn is not first.conn
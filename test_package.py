@@ -3,6 +3,7 @@
 Test script for lab_instruments package
 """
 import sys
+import itertools
 from pathlib import Path
 
 # Add the current directory to Python path for testing
@@ -62,11 +63,11 @@ def test_stub_generation():
             print("✓ Stub file generated successfully")
             
             # Show first few lines of stub file
-            content = stub_manager.stub_file.read_text()
-            lines = content.split('\n')[:10]
+            with stub_manager.stub_file.open('r', encoding='utf-8') as f:
+                lines = list(itertools.islice(f, 10))
             print("✓ Stub file preview:")
             for line in lines:
-                print(f"    {line}")
+                print(f"    {line.rstrip('\n')}")
         else:
             print("✗ Stub file not found")
             return False